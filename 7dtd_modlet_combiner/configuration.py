@@ -35,6 +35,9 @@ TARGET_LANGUAGES = EXPECTED_HEADER[7:]  # This will include all languages starti
 # Columns that should be quoted in the Localization.translated.txt
 QUOTED_COLUMNS = ['english', 'Context / Alternate Text'] + TARGET_LANGUAGES
 
+# Database column holding each EXPECTED_HEADER column, in header order
+LOCALIZATION_DB_COLUMNS = ['key', 'file', 'type', 'used_in_main_menu', 'no_translate', 'english', 'context'] + TARGET_LANGUAGES
+
 # SQL aliases for the SQLite CLI
 CLI_ALIASES = {
     '.tables': "SELECT name FROM sqlite_master WHERE type='table';",
@@ -12,10 +12,17 @@ Classes that call this class:
     - ModletWriter
 
 Methods called from this class:
-    - store_modlet_info: Called from ModletFinder
+    - store_modlet_info, store_modlet_infos_bulk: Called from ModletFinder
     - store_xml_data: Called from XMLParser
-    - store_localization_data: Called from LocalizationParser
+    - store_localization_rows: Called from FileLocator and LocalizationParser
+    - store_xml_data, store_localization_rows (module functions): Called from FileLocator for every parsed file
+    - begin, commit, rollback: Called from ModletFinder to load each modlet in one transaction
+    - flush: Called from the main script to write buffered rows
+    - create_indexes: Called from the main script once all modlets have been loaded
     - get_modlet_info, get_xml_data, get_localization_data: Called from ModletWriter
+    - get_xml_metadata_bulk: Called once per file to look up its XML block metadata
+    - get_all_xml_metadata: Called from ModletWriter to fetch the metadata of every combined XML file at once
+    - get_localization_columns: Called from ModletWriter to write Localization.txt column-wise
 
 Visual map:
 [db_processor.py] <- [modletCombiner.py]
@@ -42,13 +49,40 @@ import random
 import string
 import binascii
 import logging
+import functools
 from typing import Dict, Any, List, Union
 from .mc_logger import info, error, warning, debug
 from .configuration import get_config, versioned
-from difflib import SequenceMatcher
+from .utilities import simhash, simhash_similarity
 from tabulate import tabulate
 
 
+# Stamped into PRAGMA user_version; databases built with an older schema are wiped and rebuilt
+SCHEMA_VERSION = 2
+
+# Declared column type for encoded content; values are decoded by a registered sqlite3 converter
+ENCODED_TYPE = 'ENCODED_BLOB'
+
+# Table definitions shared by create_tables() and wipe_database()
+TABLE_SCHEMAS = {
+    'modlets': "unique_id TEXT PRIMARY KEY, name TEXT, description TEXT, author TEXT, version TEXT, website TEXT",
+    'xml_data': "id INTEGER PRIMARY KEY AUTOINCREMENT, modlet_name TEXT, unique_id TEXT, full_path TEXT, short_path TEXT, outer_tag TEXT, content ENCODED_BLOB",
+    'localization_data': "id INTEGER PRIMARY KEY AUTOINCREMENT, modlet_name TEXT, unique_id TEXT, full_path TEXT, short_path TEXT, file ENCODED_BLOB, used_in_main_menu ENCODED_BLOB, no_translate ENCODED_BLOB, type ENCODED_BLOB, key ENCODED_BLOB, english ENCODED_BLOB, context ENCODED_BLOB, german ENCODED_BLOB, latam ENCODED_BLOB, french ENCODED_BLOB, italian ENCODED_BLOB, japanese ENCODED_BLOB, koreana ENCODED_BLOB, polish ENCODED_BLOB, brazilian ENCODED_BLOB, russian ENCODED_BLOB, turkish ENCODED_BLOB, schinese ENCODED_BLOB, tchinese ENCODED_BLOB, spanish ENCODED_BLOB, value ENCODED_BLOB",
+    # Per-file block counts and sizes, maintained by the xml_stats_ai trigger
+    'xml_stats': "short_path TEXT PRIMARY KEY, block_count INTEGER, total_size INTEGER",
+}
+
+# localization_data columns in insert order. The identifying columns before
+# LOCALIZATION_ENCODED_FROM are plain TEXT so they can be filtered on; the rest are encoded.
+LOCALIZATION_COLUMNS = ('modlet_name', 'unique_id', 'full_path', 'short_path', 'file', 'used_in_main_menu', 'no_translate',
+                        'type', 'key', 'english', 'context', 'german', 'latam', 'french', 'italian', 'japanese', 'koreana',
+                        'polish', 'brazilian', 'russian', 'turkish', 'schinese', 'tchinese', 'spanish', 'value')
+LOCALIZATION_ENCODED_FROM = 4
+
+
+def _table_sql(name, if_not_exists=False):
+    """CREATE TABLE statement for a TABLE_SCHEMAS entry, as SQLite stores it in sqlite_master."""
+    return f"CREATE TABLE {'IF NOT EXISTS ' if if_not_exists else ''}{name} ({TABLE_SCHEMAS[name]})"
 
 @versioned("1.3.3")
 class DBProcessor:
@@ -65,119 +99,302 @@ class DBProcessor:
         if not self.initialized:
             self.db_path = db_path
             db_file = get_config('DATABASE_FILE', db_path)
-
-            self.conn = sqlite3.connect(db_file)
+            # Content is stored as raw UTF-8 BLOBs; DB_ENCODING=base64 restores the legacy base64 TEXT storage
+            self.encoding = get_config('DB_ENCODING', 'utf-8')
+
+            # Columns declared as ENCODED_BLOB are decoded by sqlite3 itself as rows are fetched, so
+            # only the encoder depends on the storage mode. The helpers are bound once, here.
+            if self.encoding == 'base64':
+                sqlite3.register_converter(ENCODED_TYPE, self._decode_base64)
+                self._encode_data = self._encode_base64
+            else:
+                sqlite3.register_converter(ENCODED_TYPE, functools.partial(bytes.decode, encoding='utf-8', errors='replace'))
+                self._encode_data = str.encode
+            self._decode_data = self._decode_text
+
+            # Permissions are only set on a database file created by this run
+            new_file = not os.path.exists(db_file)
+
+            # Autocommit mode; transactions are managed explicitly with BEGIN/COMMIT
+            self.conn = sqlite3.connect(db_file, isolation_level=None, detect_types=sqlite3.PARSE_DECLTYPES,
+                                        cached_statements=256)
+            # A single shared cursor; repeated SQL text is served from the statement cache
+            self._cur = self.conn.cursor()
+            if not wipe and not self._schema_is_current():
+                warning(f"[DBProcessor] {db_file} was built with an older schema; rebuilding it")
+                wipe = True
+            self._configure_connection(rebuild=wipe)
             
+            # Rows are buffered and written in batches by flush()
+            self.batch_size = int(get_config('DB_BATCH_SIZE', 1000))
+            self._xml_buf = []
+            self._loc_buf = []
+
             # Set file permissions to allow writing
-            os.chmod(db_file, 0o664)
+            if new_file:
+                os.chmod(db_file, 0o664)
             
             if wipe:
                 self.wipe_database()
             
             self.create_tables()
-            self.encoding = get_config('DB_ENCODING', 'base64')
+            # A wiped database is about to be bulk loaded; missing indexes are built afterwards by create_indexes()
+            if not wipe:
+                self.create_indexes()
+            self._cur.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+            # Content hashes of stored XML files, used for change diagnostics in debug mode
+            self._xml_hashes = {}
+            self.logger = logging.getLogger('7DTD-ModletCombiner')
             self.initialized = True
 
+    def _schema_is_current(self):
+        """
+        Return True if the database is empty, or was built with SCHEMA_VERSION and its tables
+        match TABLE_SCHEMAS. Older databases lack the localization context column and the
+        ENCODED_BLOB declared types the fetch-time converter depends on.
+        """
+        c = self._cur
+        tables = dict(c.execute("SELECT name, sql FROM sqlite_master WHERE type='table'").fetchall())
+        if not tables:
+            return True
+        if c.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            return False
+        return all(tables.get(name) in (None, _table_sql(name)) for name in TABLE_SCHEMAS)
+
+    def _configure_connection(self, rebuild=False):
+        """
+        Apply connection PRAGMAs tuned for bulk loading.
+
+        Args:
+            rebuild (bool): True when the database is being wiped and rebuilt. The database is
+                a regenerable cache in that case, so fsyncs are skipped entirely.
+        """
+        c = self._cur
+        # page_size only takes effect before the first table is created
+        c.execute("PRAGMA page_size=8192")
+        c.execute("PRAGMA journal_mode=WAL")
+        c.execute(f"PRAGMA synchronous={'OFF' if rebuild else 'NORMAL'}")
+        c.execute("PRAGMA cache_size=-262144")  # 256 MB
+        c.execute("PRAGMA temp_store=MEMORY")
+        c.execute("PRAGMA mmap_size=268435456")  # 256 MB
+
     def create_tables(self):
-        c = self.conn.cursor()
-        c.execute('''CREATE TABLE IF NOT EXISTS modlets
-                     (unique_id TEXT PRIMARY KEY, name TEXT, description TEXT, author TEXT, version TEXT, website TEXT)''')
-        c.execute('''CREATE TABLE IF NOT EXISTS xml_data
-                     (id INTEGER PRIMARY KEY AUTOINCREMENT, modlet_name TEXT, unique_id TEXT, full_path TEXT, short_path TEXT, outer_tag TEXT, content TEXT)''')
-        c.execute('''CREATE TABLE IF NOT EXISTS localization_data
-                     (id INTEGER PRIMARY KEY AUTOINCREMENT, modlet_name TEXT, unique_id TEXT, full_path TEXT, short_path TEXT, file TEXT, used_in_main_menu TEXT, no_translate TEXT, type TEXT, key TEXT,  english TEXT, german TEXT, latam TEXT, french TEXT, italian TEXT, japanese TEXT, koreana TEXT, polish TEXT, brazilian TEXT, russian TEXT, turkish TEXT, schinese TEXT, tchinese TEXT, spanish TEXT, value TEXT)''')
-        self.conn.commit()
-
-    def _encode_data(self, data: str) -> str:
-        if self.encoding == 'base64':
-            return base64.b64encode(data.encode('utf-8')).decode('ascii')
-        return data
-
-    def _decode_data(self, data: str) -> str:
+        c = self._cur
+        try:
+            c.execute("BEGIN")
+            for name in TABLE_SCHEMAS:
+                c.execute(_table_sql(name, if_not_exists=True))
+            c.execute("SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='xml_stats_ai'")
+            if c.fetchone() is None:
+                # Count the rows already present, then keep the counters current on every insert
+                c.execute('''INSERT OR REPLACE INTO xml_stats (short_path, block_count, total_size)
+                             SELECT short_path, COUNT(*), COALESCE(SUM(LENGTH(content)), 0) FROM xml_data GROUP BY short_path''')
+                c.execute('''CREATE TRIGGER xml_stats_ai AFTER INSERT ON xml_data BEGIN
+                                 INSERT INTO xml_stats (short_path, block_count, total_size)
+                                 VALUES (NEW.short_path, 1, COALESCE(LENGTH(NEW.content), 0))
+                                 ON CONFLICT(short_path) DO UPDATE SET block_count = block_count + 1,
+                                                                       total_size = total_size + excluded.total_size;
+                             END''')
+            c.execute("COMMIT")
+        except sqlite3.Error as e:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            error(f"Error creating tables: {e}")
+            raise
+
+    def create_indexes(self):
+        """Create the lookup indexes used by get_xml_data, get_xml_metadata and get_localization_data."""
+        self.flush()
+        c = self._cur
+        try:
+            c.execute("BEGIN")
+            c.execute("CREATE INDEX IF NOT EXISTS ix_xml_fps ON xml_data(full_path, short_path, outer_tag)")
+            c.execute("CREATE INDEX IF NOT EXISTS ix_xml_so ON xml_data(short_path, outer_tag)")
+            c.execute("CREATE INDEX IF NOT EXISTS ix_loc_fs ON localization_data(full_path, short_path)")
+            c.execute("COMMIT")
+        except sqlite3.Error as e:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            error(f"Error creating indexes: {e}")
+            raise
+        debug("[DBProcessor] Created lookup indexes")
+
+    @staticmethod
+    def _encode_base64(data: str) -> str:
+        """_encode_data when DB_ENCODING=base64."""
+        return base64.b64encode(data.encode('utf-8')).decode('ascii')
+
+    def _decode_base64(self, data: bytes) -> str:
+        """sqlite3 converter for ENCODED_BLOB columns when DB_ENCODING=base64."""
+        try:
+            return base64.b64decode(data).decode('utf-8')
+        except (binascii.Error, UnicodeDecodeError):
+            # Not base64 data, return it as stored
+            return data.decode('utf-8', errors='replace')
+
+    @staticmethod
+    def _decode_text(data: Union[bytes, str]) -> str:
+        """_decode_data for values fetched as bytes or text; ENCODED_BLOB values arrive already decoded."""
         if not data:
             return ''
-        if self.encoding == 'base64':
-            try:
-                return base64.b64decode(data.encode('ascii')).decode('utf-8')
-            except (binascii.Error, UnicodeDecodeError):
-                # If decoding fails, check if the data is already in a readable format
-                if all(ord(c) < 128 for c in data):
-                    return data
-                else:
-                    warning(f"Failed to decode data: {data[:20]}... Returning partial data.")
-                    return data[:50] + '...' if len(data) > 50 else data
-        return data
+        return data.decode('utf-8', errors='replace') if isinstance(data, bytes) else data
 
     def generate_unique_id(self, modlet_info):
-        """Generate a unique ID based on the modlet name and version."""
-        id_string = f"{modlet_info['name']}_{modlet_info['version']}"
-        return hashlib.md5(id_string.encode()).hexdigest()
+        """
+        Generate a unique ID based on the modlet name and version.
+
+        The ID is a 32 character blake2b hex digest. UNIQUE_ID_ALGO=md5 restores the IDs used
+        by databases built with earlier versions.
+        """
+        id_string = f"{modlet_info['name']}_{modlet_info['version']}".encode('utf-8')
+        if get_config('UNIQUE_ID_ALGO', 'blake2b') == 'md5':
+            return hashlib.md5(id_string).hexdigest()
+        return hashlib.blake2b(id_string, digest_size=16).hexdigest()
 
     def store_modlet_info(self, modlet_info):
-        c = self.conn.cursor()
+        c = self._cur
         unique_id = self.generate_unique_id(modlet_info)
         try:
             c.execute('''INSERT OR REPLACE INTO modlets (unique_id, name, description, author, version, website)
                          VALUES (?, ?, ?, ?, ?, ?)''',
                       (unique_id, modlet_info['name'], modlet_info['description'], modlet_info['author'],
                        modlet_info['version'], modlet_info['website']))
-            self.conn.commit()
             debug(f"Stored modlet info for {modlet_info['name']}")
             return unique_id
         except sqlite3.Error as e:
             error(f"Error storing modlet info for {modlet_info['name']}: {str(e)}")
             return None
 
-    def calculate_difference_percentage(self, str1, str2):
-        """Calculate the difference percentage between two strings."""
-        matcher = SequenceMatcher(None, str1, str2)
-        similarity = matcher.ratio()
-        return (1 - similarity) * 100
+    def store_modlet_infos_bulk(self, modlet_infos: List[Dict[str, str]]) -> None:
+        """
+        Store several modlets' information in a single transaction.
 
-    def store_xml_data(self, modlet_name, unique_id, full_path, short_path, outer_tag, content):
+        Args:
+            modlet_infos (List[Dict[str, str]]): Modlet information as returned by ModletFinder
+        """
+        if not modlet_infos:
+            return
+        c = self._cur
         try:
-            cursor = self.conn.cursor()
-            debug(f"[DBProcessor] Storing XML data for {full_path}")
-            debug(f"[DBProcessor] Content preview: {content[:100]}...")  # Log first 100 characters of content
-            encoded_content = self._encode_data(content)
-            cursor.execute('''
-                INSERT OR REPLACE INTO xml_data (modlet_name, unique_id, full_path, short_path, outer_tag, content)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (modlet_name, unique_id, full_path, short_path, outer_tag, encoded_content))
-            self.conn.commit()
-            debug(f"[DBProcessor] Stored XML data for {full_path}")
-
-            # Check if the data was updated
-            cursor.execute('SELECT content FROM xml_data WHERE modlet_name = ? AND full_path = ?', (modlet_name, full_path))
-            stored_data = cursor.fetchone()[0]
-
-            if stored_data != encoded_content:
-                diff_percentage = self.calculate_difference_percentage(stored_data, encoded_content)
-                if diff_percentage > 10:
-                    warning(f"Significant difference (>{diff_percentage:.2f}%) detected in stored XML data for {modlet_name} - {full_path}")
-                else:
-                    debug(f"Minor difference ({diff_percentage:.2f}%) detected in stored XML data for {modlet_name} - {full_path}")
-
+            c.execute("BEGIN")
+            c.executemany('''INSERT OR REPLACE INTO modlets (unique_id, name, description, author, version, website)
+                             VALUES (?, ?, ?, ?, ?, ?)''',
+                          [(self.generate_unique_id(info), info['name'], info['description'], info['author'],
+                            info['version'], info['website']) for info in modlet_infos])
+            c.execute("COMMIT")
+            debug(f"Stored modlet info for {len(modlet_infos)} modlets")
         except sqlite3.Error as e:
-            error(f"[DBProcessor] Error storing XML data: {e}")
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            error(f"Error storing modlet info: {str(e)}")
 
-    def store_localization_data(self, modlet_name, unique_id, full_path, short_path, file, used_in_main_menu, no_translate, type, key, english, german, latam, french, italian, japanese, koreana, polish, brazilian, russian, turkish, schinese, tchinese, spanish, value):
+    def store_xml_data(self, modlet_name, unique_id, full_path, short_path, outer_tag, content):
+        """Buffer an XML row for insertion. Rows are written to the database by flush()."""
+        debug("[DBProcessor] Storing XML data for %s", full_path)
+        debug("[DBProcessor] Content preview: %.100s...", content)  # Log first 100 characters of content
+        encoded_content = self._encode_data(content)
+        # Change diagnostics are only needed in debug mode
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._check_xml_change(modlet_name, full_path, content)
+        self._xml_buf.append((modlet_name, unique_id, full_path, short_path, outer_tag, encoded_content))
+        if len(self._xml_buf) >= self.batch_size:
+            self.flush()
+
+    def _check_xml_change(self, modlet_name, full_path, content):
+        """
+        Report when a previously stored XML file is stored again with different content.
+
+        The content digest and SimHash signature are kept in memory only, in _xml_hashes.
+        """
+        data = content.encode('utf-8')
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        signature = simhash(data)
+        previous = self._xml_hashes.get((modlet_name, full_path))
+        self._xml_hashes[(modlet_name, full_path)] = (digest, signature)
+        if previous is None or previous[0] == digest:
+            return
+
+        diff_percentage = (1 - simhash_similarity(previous[1], signature)) * 100
+        if diff_percentage > 10:
+            warning(f"Significant difference (>{diff_percentage:.2f}%) detected in stored XML data for {modlet_name} - {full_path}")
+        else:
+            debug(f"Minor difference ({diff_percentage:.2f}%) detected in stored XML data for {modlet_name} - {full_path}")
+
+    def store_localization_rows(self, rows: List[Dict[str, str]]) -> None:
+        """
+        Buffer localization rows for insertion. Rows are written to the database by flush().
+
+        Args:
+            rows (List[Dict[str, str]]): One dict per entry, keyed by localization_data column name.
+                Missing columns are stored as empty strings.
+        """
+        if not rows:
+            return
+        # Stage the rows column by column, then encode each value column in one pass
+        columns = [[row.get(column, '') for row in rows] for column in LOCALIZATION_COLUMNS]
+        encode = self._encode_data
+        for i in range(LOCALIZATION_ENCODED_FROM, len(columns)):
+            columns[i] = list(map(encode, map(str, columns[i])))
+        self._loc_buf.extend(zip(*columns))
+        if len(self._loc_buf) >= self.batch_size:
+            self.flush()
+
+    def begin(self):
+        """Start an explicit transaction. Buffered rows and writes are committed together by commit()."""
+        self._cur.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        """Flush buffered rows and commit the transaction started by begin()."""
+        self.flush()
+        self._cur.execute("COMMIT")
+
+    def rollback(self):
+        """Discard buffered rows and roll back the transaction started by begin()."""
+        self._xml_buf.clear()
+        self._loc_buf.clear()
+        self.conn.rollback()
+
+    def flush(self):
+        """
+        Write all buffered XML and localization rows to the database.
+
+        Outside of begin()/commit() the rows are written in their own transaction; inside one
+        they become part of it, and errors are raised so the caller can roll back.
+        """
+        if not self._xml_buf and not self._loc_buf:
+            return
+        in_transaction = self.conn.in_transaction
         try:
-            cursor = self.conn.cursor()
-            encoded_data = [self._encode_data(str(item)) for item in [modlet_name, unique_id, full_path, short_path, file, used_in_main_menu, no_translate, type, key, english, german, latam, french, italian, japanese, koreana, polish, brazilian, russian, turkish, schinese, tchinese, spanish, value]]
-            cursor.execute('''
-                INSERT OR REPLACE INTO localization_data 
-                (modlet_name, unique_id, full_path, short_path, file, used_in_main_menu, no_translate, type, key, english, german, latam, french, italian, japanese, koreana, polish, brazilian, russian, turkish, schinese, tchinese, spanish, value)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', encoded_data)
-            self.conn.commit()
+            cursor = self._cur
+            if not in_transaction:
+                cursor.execute("BEGIN")
+            if self._xml_buf:
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO xml_data (modlet_name, unique_id, full_path, short_path, outer_tag, content)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', self._xml_buf)
+            if self._loc_buf:
+                cursor.executemany(f'''
+                    INSERT OR REPLACE INTO localization_data ({', '.join(LOCALIZATION_COLUMNS)})
+                    VALUES ({', '.join('?' * len(LOCALIZATION_COLUMNS))})
+                ''', self._loc_buf)
+            if not in_transaction:
+                cursor.execute("COMMIT")
+            debug("[DBProcessor] Flushed %d XML rows and %d localization rows", len(self._xml_buf), len(self._loc_buf))
         except sqlite3.Error as e:
-            error(f"Error storing localization data: {e}")
+            error(f"[DBProcessor] Error flushing buffered data: {e}")
+            if in_transaction:
+                raise
+            self.conn.rollback()
+        finally:
+            self._xml_buf.clear()
+            self._loc_buf.clear()
 
     def get_modlet_info(self, modlet_id: str) -> Dict[str, str]:
         """Retrieve modlet information from the database"""
         try:
-            c = self.conn.cursor()
+            c = self._cur
             c.execute("SELECT * FROM modlets WHERE unique_id = ?", (modlet_id,))
             row = c.fetchone()
             if row:
@@ -197,7 +414,8 @@ class DBProcessor:
     def get_xml_data(self, full_path: str, short_path: str, outer_tag: str) -> Dict[str, Dict[str, str]]:
         """Retrieve XML data from the database"""
         try:
-            c = self.conn.cursor()
+            self.flush()
+            c = self._cur
             if full_path and short_path and outer_tag:
                 c.execute("""SELECT short_path, outer_tag, content FROM xml_data 
                              WHERE full_path = ? AND short_path = ? AND outer_tag = ?""",
@@ -212,7 +430,7 @@ class DBProcessor:
                     xml_data[short_path] = {}
                 if outer_tag not in xml_data[short_path]:
                     xml_data[short_path][outer_tag] = []
-                xml_data[short_path][outer_tag].append(self._decode_data(content))
+                xml_data[short_path][outer_tag].append(content or '')
             
             debug(f"Retrieved {len(xml_data)} XML files from database")
             for short_path, content in xml_data.items():
@@ -225,23 +443,52 @@ class DBProcessor:
 
     def get_localization_data(self, full_path: str, short_path: str) -> List[Dict[str, str]]:
         try:
-            c = self.conn.cursor()
+            self.flush()
+            c = self._cur
             if full_path and short_path:
-                c.execute("""SELECT modlet_name, unique_id, full_path, short_path, file, used_in_main_menu, no_translate, type, key, english, german, latam, french, italian, japanese, koreana, polish, brazilian, russian, turkish, schinese, tchinese, spanish, value
+                c.execute(f"""SELECT {', '.join(LOCALIZATION_COLUMNS)}
                              FROM localization_data 
                              WHERE full_path = ? AND short_path = ?""",
                           (full_path, short_path))
             else:
-                c.execute("""SELECT modlet_name, unique_id, full_path, short_path, file, used_in_main_menu, no_translate, type, key, english, german, latam, french, italian, japanese, koreana, polish, brazilian, russian, turkish, schinese, tchinese, spanish, value
+                c.execute(f"""SELECT {', '.join(LOCALIZATION_COLUMNS)}
                              FROM localization_data""")
             
+            # Encoded columns are already decoded by the ENCODED_BLOB converter.
+            # sqlite3 returns zero-length BLOBs as None, so map those back to ''.
             columns = [column[0] for column in c.description]
-            results = c.fetchall()
-            decoded_results = []
-            for row in results:
-                decoded_row = [self._decode_data(item) if item is not None else '' for item in row]
-                decoded_results.append(dict(zip(columns, decoded_row)))
-            return decoded_results
+            return [dict(zip(columns, (item if item is not None else '' for item in row))) for row in c.fetchall()]
+        except sqlite3.Error as e:
+            error(f"[DBProcessor] Error retrieving localization data: {e}")
+            raise
+
+    def get_localization_columns(self, full_path: str, short_path: str,
+                                 columns=LOCALIZATION_COLUMNS) -> Dict[str, List[str]]:
+        """
+        Retrieve localization data column-wise, as one list of values per column.
+
+        Args:
+            full_path (str): Restrict to this file; pass '' together with short_path for all rows
+            short_path (str): Restrict to this short path
+            columns: The localization_data columns to return
+
+        Returns:
+            Dict[str, List[str]]: Each requested column mapped to its values, in row order
+        """
+        try:
+            self.flush()
+            c = self._cur
+            if full_path and short_path:
+                c.execute(f"SELECT {', '.join(columns)} FROM localization_data WHERE full_path = ? AND short_path = ?",
+                          (full_path, short_path))
+            else:
+                c.execute(f"SELECT {', '.join(columns)} FROM localization_data")
+            rows = c.fetchall()
+            if not rows:
+                return {column: [] for column in columns}
+            # Transpose the rows; zero-length BLOBs come back as None, so map those back to ''
+            return {column: [item if item is not None else '' for item in values]
+                    for column, values in zip(columns, zip(*rows))}
         except sqlite3.Error as e:
             error(f"[DBProcessor] Error retrieving localization data: {e}")
             raise
@@ -251,7 +498,7 @@ class DBProcessor:
 
     def _validate_stored_data(self, table: str, id_value: str, original_data: Dict[str, Any]) -> None:
         """Validate that the stored data matches the original data"""
-        c = self.conn.cursor()
+        c = self._cur
         c.execute(f"SELECT * FROM {table} WHERE unique_id = ?", (id_value,))
         stored_data = c.fetchone()
         
@@ -270,21 +517,65 @@ class DBProcessor:
     def get_xml_metadata(self, short_path: str, outer_tag: str, content: str) -> Dict[str, str]:
         """Retrieve metadata for a specific XML entry"""
         try:
-            c = self.conn.cursor()
+            c = self._cur
             c.execute("""SELECT modlet_name, full_path FROM xml_data 
                         WHERE short_path = ? AND outer_tag = ? AND content = ?""",
-                    (short_path, outer_tag, content))
+                    (short_path, outer_tag, self._encode_data(content)))
             result = c.fetchone()
             if result:
                 return {
-                    'modlet_name': self._decode_data(result[0]),
-                    'full_path': self._decode_data(result[1])
+                    'modlet_name': result[0],
+                    'full_path': result[1]
                 }
             return {'modlet_name': 'Unknown', 'full_path': 'Unknown'}
         except sqlite3.Error as e:
             error(f"[DBProcessor] Error retrieving XML metadata: {e}")
             return {'modlet_name': 'Error', 'full_path': 'Error'}
 
+    def get_xml_metadata_bulk(self, short_path: str) -> Dict[tuple, Dict[str, str]]:
+        """
+        Retrieve the metadata of every XML entry for a short path in one query.
+
+        Args:
+            short_path (str): The short path of the XML file
+
+        Returns:
+            Dict[tuple, Dict[str, str]]: Metadata keyed by (outer_tag, content), as returned by get_xml_metadata
+        """
+        try:
+            self.flush()
+            c = self._cur
+            c.execute("""SELECT outer_tag, content, modlet_name, full_path FROM xml_data
+                         WHERE short_path = ? ORDER BY id""", (short_path,))
+            metadata = {}
+            for outer_tag, content, modlet_name, full_path in c.fetchall():
+                # The first stored entry wins, as with get_xml_metadata
+                metadata.setdefault((outer_tag, content or ''), {'modlet_name': modlet_name, 'full_path': full_path})
+            return metadata
+        except sqlite3.Error as e:
+            error(f"[DBProcessor] Error retrieving XML metadata: {e}")
+            return {}
+
+    def get_all_xml_metadata(self) -> Dict[str, Dict[tuple, Dict[str, str]]]:
+        """
+        Retrieve the metadata of every XML entry in one query, grouped by short path.
+
+        Returns:
+            Dict[str, Dict[tuple, Dict[str, str]]]: For each short path, the get_xml_metadata_bulk result
+        """
+        try:
+            self.flush()
+            c = self._cur
+            c.execute("SELECT short_path, outer_tag, content, modlet_name, full_path FROM xml_data ORDER BY id")
+            metadata = {}
+            for short_path, outer_tag, content, modlet_name, full_path in c:
+                # The first stored entry wins, as with get_xml_metadata
+                metadata.setdefault(short_path, {}).setdefault((outer_tag, content or ''), {'modlet_name': modlet_name, 'full_path': full_path})
+            return metadata
+        except sqlite3.Error as e:
+            error(f"[DBProcessor] Error retrieving XML metadata: {e}")
+            return {}
+
     def __del__(self):
         """Close the database connection when the object is destroyed"""
         if hasattr(self, 'conn'):
@@ -295,27 +586,23 @@ class DBProcessor:
         Display various statistics about the database content.
         """
         try:
-            c = self.conn.cursor()
+            self.flush()
+            c = self._cur
             
             # Number of different modlets
             c.execute("SELECT COUNT(DISTINCT unique_id) FROM modlets")
             modlet_count = c.fetchone()[0]
             
-            # Number of different short_file variations (excluding ModInfo.xml)
-            c.execute("SELECT COUNT(DISTINCT short_path) FROM xml_data WHERE short_path != 'ModInfo.xml'")
-            short_file_count = c.fetchone()[0]
-            
-            # XML blocks per file with total size
-            c.execute("""
-                SELECT short_path, COUNT(outer_tag) as block_count, SUM(LENGTH(content)) as total_size 
-                FROM xml_data 
-                GROUP BY short_path
-            """)
+            # Per-file counters are kept up to date by the xml_stats_ai trigger
+            c.execute("SELECT short_path, block_count, total_size FROM xml_stats ORDER BY short_path")
             xml_blocks = c.fetchall()
+
+            # Number of different short_file variations (excluding ModInfo.xml)
+            short_file_count = sum(1 for short_path, _, _ in xml_blocks if short_path != 'ModInfo.xml')
             
             # Total XML content size
-            c.execute("SELECT SUM(LENGTH(content)) FROM xml_data")
-            total_xml_size = c.fetchone()[0]
+            total_xml_size = sum(size for _, _, size in xml_blocks)
+            total_block_count = sum(count for _, count, _ in xml_blocks)
             
             # Number of localization entries
             c.execute("SELECT COUNT(*) FROM localization_data")
@@ -326,8 +613,7 @@ class DBProcessor:
             unique_outer_tags = c.fetchone()[0]
             
             # Average content size per XML block
-            c.execute("SELECT AVG(LENGTH(content)) FROM xml_data")
-            avg_xml_size = c.fetchone()[0]
+            avg_xml_size = total_xml_size / total_block_count if total_block_count else 0
             
             # Prepare the statistics table
             stats = [
@@ -350,29 +636,48 @@ class DBProcessor:
             error(f"Error retrieving database statistics: {e}")
 
     def wipe_database(self):
-        """Wipe all data from the database."""
+        """Wipe all data from the database, keeping the schema and its indexes in place.
+
+        Tables are emptied with DELETE so their pages and indexes are reused by the next load.
+        Tables whose definition no longer matches TABLE_SCHEMAS (or that are unknown) are dropped
+        and recreated by create_tables(). The file is only vacuumed once it has grown past
+        DB_VACUUM_PAGES pages.
+        """
         try:
-            c = self.conn.cursor()
-            # Get all table names except sqlite_sequence
-            c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name != 'sqlite_sequence';")
+            c = self._cur
+            c.execute("BEGIN")
+            c.execute("SELECT name, sql FROM sqlite_master WHERE type='table'")
             tables = c.fetchall()
-            
-            # Drop all tables except sqlite_sequence
-            for table in tables:
-                c.execute(f"DROP TABLE IF EXISTS {table[0]}")
-            
-            # Clear the sqlite_sequence table
-            c.execute("DELETE FROM sqlite_sequence;")
-            
-            self.conn.commit()
+
+            for name, sql in tables:
+                if name == 'sqlite_sequence':
+                    continue
+                quoted = '"' + name.replace('"', '""') + '"'
+                if name in TABLE_SCHEMAS and sql == _table_sql(name):
+                    c.execute(f"DELETE FROM {quoted}")
+                else:
+                    c.execute(f"DROP TABLE IF EXISTS {quoted}")
+
+            # sqlite_sequence only exists once an AUTOINCREMENT table has been created
+            if any(name == 'sqlite_sequence' for name, _ in tables):
+                c.execute("DELETE FROM sqlite_sequence")
+
+            c.execute("COMMIT")
+
+            page_count = c.execute("PRAGMA page_count").fetchone()[0]
+            if page_count > int(get_config('DB_VACUUM_PAGES', 131072)):
+                c.execute("VACUUM")
+                debug(f"Database vacuumed ({page_count} pages)")
             debug("Database wiped successfully")
         except sqlite3.Error as e:
+            if self.conn.in_transaction:
+                self.conn.rollback()
             error(f"Error wiping database: {e}")
 
     def get_all_modlet_info(self) -> List[Dict[str, Any]]:
         """Retrieve information for all modlets"""
         try:
-            c = self.conn.cursor()
+            c = self._cur
             c.execute("SELECT name, version, author FROM modlets")
             results = c.fetchall()
             
@@ -387,4 +692,13 @@ class DBProcessor:
             return modlet_info
         except sqlite3.Error as e:
             error(f"[DBProcessor] Error retrieving all modlet info: {e}")
-            return []
\ No newline at end of file
+            return []
+
+
+def store_xml_data(modlet_name, unique_id, full_path, short_path, outer_tag, content):
+    """Buffer an XML row on the initialized DBProcessor. See DBProcessor.store_xml_data."""
+    DBProcessor._instance.store_xml_data(modlet_name, unique_id, full_path, short_path, outer_tag, content)
+
+def store_localization_rows(rows: List[Dict[str, str]]) -> None:
+    """Buffer localization rows on the initialized DBProcessor. See DBProcessor.store_localization_rows."""
+    DBProcessor._instance.store_localization_rows(rows)
@@ -9,6 +9,7 @@ Classes that call this class:
 Methods called from this class:
     - locate_files: Called from ModletFinder
     - process_files: Called after locate_files to parse and process the found files
+    - parse_files, store_files: Called from ModletFinder to parse modlets on worker threads and store them in order
     - get_file_counts: Called from ModletFinder
 
 Visual map:
@@ -16,14 +17,18 @@ Visual map:
                   <- [modlet_finder.py]
                   -> [parser_xml.py]
                   -> [parser_localization.py]
+                  -> [db_processor.py]
 """
 
 import os
-from typing import List, Dict
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from .mc_logger import info, error, warning, debug
 from .configuration import get_config, versioned
 from .parser_xml import XMLParser
 from .parser_localization import LocalizationParser
+from .db_processor import store_xml_data as _store_xml_data, store_localization_rows as _store_localization_rows
 
 @versioned("1.3.1")
 class FileLocator:
@@ -31,9 +36,13 @@ class FileLocator:
         self.source_paths = source_paths
         self.xml_files: List[str] = []
         self.localization_files: List[str] = []
+        # Located files keyed by the search path they were found under, for process_files
+        self.xml_files_by_path: Dict[str, List[str]] = {}
+        self.localization_files_by_path: Dict[str, List[str]] = {}
         self.total_char_count = 0
         self.xml_parser = XMLParser()
         self.localization_parser = LocalizationParser()
+        self.max_workers = int(get_config('FILE_WORKERS', min(32, (os.cpu_count() or 1) * 4)))
 
     def locate_files(self, file_type, path=None, exclude=None):
         """
@@ -42,66 +51,154 @@ class FileLocator:
         Args:
             file_type (str): The file type to search for ('.xml' or 'Localization.txt')
             path (str, optional): The specific path to search. If None, uses self.source_paths
-            exclude (List[str], optional): List of directories to exclude
+            exclude (List[str], optional): List of directory or file names to exclude
 
         Returns:
             List[str]: A list of file paths matching the file type
         """
-        found_files = []
+        if file_type == '.xml':
+            found_files = self.xml_files
+            files_by_path = self.xml_files_by_path
+            matches = lambda name: name.endswith('.xml')
+        elif file_type == 'Localization.txt':
+            found_files = self.localization_files
+            files_by_path = self.localization_files_by_path
+            matches = lambda name: name.lower() == 'localization.txt'
+        else:
+            return []
+
+        # Matches are collected locally and added to the shared lists in one step each, so
+        # different modlets can be located from several threads at once
+        new_files = []
+        exclude_set = frozenset(exclude or ())
         search_paths = [path] if path else self.source_paths
         for directory in search_paths:
-            for root, _, files in os.walk(directory):
-                if exclude and any(ex in root for ex in exclude):
-                    continue
-                for file in files:
-                    if file_type == '.xml' and file.endswith('.xml'):
-                        full_path = os.path.join(root, file)
-                        found_files.append(full_path)
-                        self.xml_files.append(full_path)
-                    elif file_type == 'Localization.txt' and file.lower() == 'localization.txt':
-                        full_path = os.path.join(root, file)
-                        found_files.append(full_path)
-                        self.localization_files.append(full_path)
-
-        return found_files
+            path_files = [entry.path for entry in self._scan_files(directory, exclude_set) if matches(entry.name)]
+            files_by_path.setdefault(directory, []).extend(path_files)
+            new_files.extend(path_files)
+
+        found_files.extend(new_files)
+        return new_files
+
+    def _scan_files(self, directory, exclude_set):
+        """
+        Recursively yield a DirEntry for every file below a directory, in os.walk order.
+
+        Args:
+            directory (str): The directory to scan
+            exclude_set (frozenset): Directory and file names to skip
+        """
+        try:
+            with os.scandir(directory) as entries:
+                subdirs = []
+                for entry in entries:
+                    if entry.name in exclude_set:
+                        continue
+                    if entry.is_dir():
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+        except OSError as e:
+            warning(f"[FileLocator] Unable to scan directory {directory}: {str(e)}")
+            return
+
+        for subdir in subdirs:
+            yield from self._scan_files(subdir, exclude_set)
 
     def process_files(self, modlet_name: str, unique_id: str, path: str) -> None:
         """
         Process the located files using the appropriate parsers.
 
+        Files are read and parsed concurrently; the parsed rows are then stored on the
+        calling thread in file order, so database writes stay serialized.
+
         Args:
             modlet_name (str): Name of the modlet
             unique_id (str): Unique identifier for the modlet
-            path (str): The specific path to process files from
+            path (str): The path the files were located under by locate_files
         """
-        xml_files = [f for f in self.xml_files if f.startswith(path)]
-        localization_files = [f for f in self.localization_files if f.startswith(path)]
+        self.store_files(self.parse_files(modlet_name, unique_id, path, concurrent=True))
 
-        for xml_file in xml_files:
-            self._process_xml_file(xml_file, modlet_name, unique_id)
+    def parse_files(self, modlet_name: str, unique_id: str, path: str, concurrent: bool = False) -> Tuple[list, list]:
+        """
+        Read and parse the files located under a path, without touching the database.
 
-        for localization_file in localization_files:
-            self._process_localization_file(localization_file, modlet_name, unique_id)
+        Safe to call from worker threads; the result is passed to store_files on the thread that owns the database.
 
-    def _process_xml_file(self, file_path: str, modlet_name: str, unique_id: str) -> None:
+        Args:
+            modlet_name (str): Name of the modlet
+            unique_id (str): Unique identifier for the modlet
+            path (str): The path the files were located under by locate_files
+            concurrent (bool): Parse the files on a thread pool instead of one after another
+
+        Returns:
+            Tuple[list, list]: The (size, row) results of the XML files and the (character count, rows)
+            results of the Localization files, in file order
+        """
+        xml_files = self.xml_files_by_path.get(path, [])
+        localization_files = self.localization_files_by_path.get(path, [])
+        if not xml_files and not localization_files:
+            return [], []
+
+        parse_xml = lambda f: self._process_xml_file(f, modlet_name, unique_id)
+        parse_localization = lambda f: self._process_localization_file(f, modlet_name, unique_id)
+        if not concurrent:
+            return list(map(parse_xml, xml_files)), list(map(parse_localization, localization_files))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            xml_results = list(executor.map(parse_xml, xml_files))
+            localization_results = list(executor.map(parse_localization, localization_files))
+        return xml_results, localization_results
+
+    def store_files(self, results: Tuple[list, list]) -> None:
+        """
+        Store the rows returned by parse_files. Must run on the thread that owns the database.
+
+        Args:
+            results (Tuple[list, list]): The XML and Localization results of parse_files
+        """
+        xml_results, localization_results = results
+        for char_count, row in xml_results:
+            self.total_char_count += char_count
+            if row is not None:
+                _store_xml_data(*row)
+
+        for char_count, rows in localization_results:
+            self.total_char_count += char_count
+            _store_localization_rows(rows)
+        debug(f"[FileLocator] Total character count: {self.total_char_count}")
+
+    def _process_xml_file(self, file_path: str, modlet_name: str, unique_id: str) -> Tuple[int, Optional[tuple]]:
+        """Parse one XML file. Runs on a worker thread and returns (file size, row)."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            self.total_char_count += len(content)
-            self.xml_parser.parse(file_path, modlet_name, unique_id, content)
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    # Empty files cannot be memory-mapped
+                    return 0, self.xml_parser.parse_stream(file_path, modlet_name, unique_id, f)
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return size, self.xml_parser.parse_stream(file_path, modlet_name, unique_id, mm)
         except Exception as e:
             error(f"[FileLocator] Error processing XML file {file_path}: {str(e)}")
+            return 0, None
 
-    def _process_localization_file(self, file_path: str, modlet_name: str, unique_id: str) -> None:
+    def _process_localization_file(self, file_path: str, modlet_name: str, unique_id: str) -> Tuple[int, List[Dict[str, str]]]:
+        """Read and parse one Localization file. Runs on a worker thread and returns (file size, rows)."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            self.total_char_count += len(content)
-            debug(f"[FileLocator] Total character count: {self.total_char_count}")
-            self.localization_parser.parse(file_path, modlet_name, unique_id, content)
-            debug(f"[FileLocator] Finished processing Localization file {file_path}")
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    content = ''
+                else:
+                    # Decode straight from the mapped pages, skipping the intermediate bytes copy
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        content = str(mm, 'utf-8')
+            rows = self.localization_parser.parse_rows(file_path, modlet_name, unique_id, content)
+            debug("[FileLocator] Finished processing Localization file %s", file_path)
+            return size, rows
         except Exception as e:
             error(f"[FileLocator] Error processing Localization file {file_path}: {str(e)}")
+            return 0, []
 
     def get_file_counts(self) -> tuple[int, int]:
         """
@@ -114,7 +211,7 @@ class FileLocator:
 
     def get_total_char_count(self) -> int:
         """
-        Get the total character count of all processed files.
+        Get the total character count of all processed files, counted as their size in bytes.
 
         Returns:
             int: Total character count
@@ -11,56 +11,105 @@ Classes that call this class:
 Methods called from this class:
     - info, debug, error, warning, critical: Called from various parts of the project
     - set_log_level: Called from main script to set log level from command-line argument
+    - is_debug: Called from hot loops to skip building debug messages at higher log levels
     - delete_old_logs: Called periodically to manage log file storage
 
+Log records are queued and written by a background QueueListener thread, so logging
+calls do not wait on file, console or syslog output.
+
 Visual map:
-[mc_logger.py] -> [syslog, file system, stdout]
+[mc_logger.py] -> [queue] -> [listener thread] -> [syslog, file system, stdout]
                 <- [modletCombiner.py]
                 <- [All other modules for logging]
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import sys
-import traceback
+import threading
+import time
 from typing import Optional
 from .configuration import get_config, versioned
 from logging.handlers import RotatingFileHandler
 
+class _FastRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that checks whether the log is a regular file once per rollover instead of on every record."""
+
+    def __init__(self, *args, **kwargs):
+        self._checked_regular = None
+        super().__init__(*args, **kwargs)
+
+    def shouldRollover(self, record):
+        if self.stream is None:
+            return False
+        if self.maxBytes <= 0:
+            return False
+        msg = "%s\n" % self.format(record)
+        self.stream.seek(0, 2)
+        if self.stream.tell() + len(msg) < self.maxBytes:
+            return False
+        if self._checked_regular is None:
+            # Special files such as /dev/null are never rolled over
+            self._checked_regular = (not os.path.exists(self.baseFilename)) or os.path.isfile(self.baseFilename)
+        return self._checked_regular
+
+    def doRollover(self):
+        super().doRollover()
+        self._checked_regular = None
+
 @versioned("1.3.4")
 class MCLogger:
     _instance = None
+    _lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(MCLogger, cls).__new__(cls)
-            cls._instance._initialize_logger()
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super(MCLogger, cls).__new__(cls)
+                    instance._initialized = False
+                    cls._instance = instance
         return cls._instance
 
+    def __init__(self):
+        # The handlers and the listener thread are set up exactly once
+        with self._lock:
+            if self._initialized:
+                return
+            self._initialize_logger()
+            self._initialized = True
+
     def _initialize_logger(self):
         self.logger = logging.getLogger('7DTD-ModletCombiner')
         self.logger.setLevel(logging.INFO)
 
-        # Clear any existing handlers
-        self.logger.handlers.clear()
-
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handlers = []
 
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+        handlers.append(console_handler)
 
         # File handler with rotation
         log_file = get_config('LOG_FILE', 'modlet_combiner.log')
         max_bytes = int(get_config('LOG_MAX_BYTES', 1024 * 1024))  # 1 MB
         backup_count = int(get_config('LOG_BACKUP_COUNT', 5))
-        file_handler = logging.handlers.RotatingFileHandler(
+        file_handler = _FastRotatingFileHandler(
             log_file, maxBytes=max_bytes, backupCount=backup_count
         )
         file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
+        # Buffer file records in memory and write them in bulk; errors are written immediately
+        self.file_buffer = logging.handlers.MemoryHandler(
+            capacity=int(get_config('LOG_MEMORY_CAPACITY', 1024)), flushLevel=logging.ERROR,
+            target=file_handler, flushOnClose=True
+        )
+        handlers.append(self.file_buffer)
+        # Registered before the listener's stop, so it runs after the queue has been drained
+        atexit.register(self.file_buffer.close)
 
         # Syslog handler (optional)
         try:
@@ -68,27 +117,27 @@ class MCLogger:
             if os.path.exists(syslog_address):
                 syslog_handler = logging.handlers.SysLogHandler(address=syslog_address)
                 syslog_handler.setFormatter(formatter)
-                self.logger.addHandler(syslog_handler)
+                handlers.append(syslog_handler)
         except Exception as e:
             print(f"Warning: Unable to initialize syslog handler: {e}")
 
+        # The handlers run on a background listener thread; callers only enqueue records
+        self._log_queue = queue.Queue(-1)
+        self.logger.addHandler(logging.handlers.QueueHandler(self._log_queue))
+        self.listener = logging.handlers.QueueListener(self._log_queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+        # Stopping the listener writes out any records still in the queue
+        atexit.register(self.listener.stop)
+
     def info(self, message: str) -> None:
         self.logger.info(message)
 
-    def debug(self, message: str) -> None:
-        self.logger.debug(message)
+    def debug(self, message: str, *args) -> None:
+        self.logger.debug(message, *args)
 
     def error(self, message: str, exc_info=False) -> None:
-        if exc_info:
-            exc_type, exc_value, exc_traceback = sys.exc_info()
-            tb_str = ''.join(traceback.format_exception(exc_type, exc_value, exc_traceback))
-            self.logger.error(f"{message}\n{tb_str}")
-            # Print a truncated version to stdout
-            print(f"Error: {message}")
-            print("Traceback (most recent call last):")
-            print('\n'.join(tb_str.split('\n')[-5:]))  # Print last 5 lines of traceback
-        else:
-            self.logger.error(message)
+        # The traceback is formatted once by logging and shared by every handler
+        self.logger.error(message, exc_info=exc_info)
 
     def warning(self, message: str) -> None:
         self.logger.warning(message)
@@ -107,26 +156,31 @@ class MCLogger:
     def set_log_level(self, level: str) -> None:
         level = level.upper()
         self.logger.setLevel(level)
-        # Update all handlers to use the new level
-        for handler in self.logger.handlers:
+        # Update all handlers to use the new level, including those owned by the listener
+        for handler in self.logger.handlers + list(self.listener.handlers):
             handler.setLevel(level)
         self.debug(f"Log level set to {level}")
 
+    def is_debug(self) -> bool:
+        return self.logger.isEnabledFor(logging.DEBUG)
+
     def get_log_level(self) -> str:
         return logging.getLevelName(self.logger.level)
 
     def delete_old_logs(self) -> None:
         log_dir = os.path.dirname(get_config('LOG_FILE', 'modlet_combiner.log'))
         max_age_days = int(get_config('LOG_MAX_AGE_DAYS', 30))
-        current_time = time.time()
-
-        for filename in os.listdir(log_dir):
-            if filename.startswith('modlet_combiner') and filename.endswith('.log'):
-                file_path = os.path.join(log_dir, filename)
-                file_age = current_time - os.path.getmtime(file_path)
-                if file_age > max_age_days * 86400:  # 86400 seconds in a day
-                    os.remove(file_path)
-                    self.info(f"Deleted old log file: {filename}")
+        cutoff = time.time() - max_age_days * 86400  # 86400 seconds in a day
+
+        # DirEntry objects carry the stat information gathered while scanning the directory
+        with os.scandir(log_dir or '.') as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith('modlet_combiner') and name.endswith('.log')):
+                    continue
+                if entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    self.info(f"Deleted old log file: {name}")
 
 # Create a single instance of MCLogger
 logger = MCLogger()
@@ -135,11 +189,12 @@ logger = MCLogger()
 def info(message: str) -> None:
     logger.info(message)
 
-def debug(message: str) -> None:
-    logger.debug(message)
+def debug(message: str, *args) -> None:
+    """Log a debug message. Formatting arguments are only applied if the message is emitted."""
+    logger.debug(message, *args)
 
-def error(message: str) -> None:
-    logger.error(message)
+def error(message: str, exc_info=False) -> None:
+    logger.error(message, exc_info=exc_info)
 
 def warning(message: str) -> None:
     logger.warning(message)
@@ -150,6 +205,10 @@ def critical(message: str) -> None:
 def exception(message: str) -> None:
     logger.exception(message)
 
+def is_debug() -> bool:
+    """Return True if debug records would be emitted, so callers can skip building them."""
+    return logger.is_debug()
+
 def set_log_level(level: str) -> None:
     logger.set_log_level(level)
 
@@ -55,6 +55,7 @@ Dependencies:
 """
 
 import argparse
+import bisect
 import sys
 import time
 import os
@@ -170,6 +171,8 @@ def run_modlet_combiner(args: Dict[str, Any], db_processor: DBProcessor, modlet_
         debug("Locating ModInfo.xml files")
         modlets = modlet_finder.find_modlets()
         debug(f"Found {len(modlets)} modlets")
+        db_processor.flush()
+        db_processor.create_indexes()
 
         combined_modlet_info = {
             'Name': args.get('modlet_name', 'Combined Modlet'),
@@ -185,6 +188,12 @@ def run_modlet_combiner(args: Dict[str, Any], db_processor: DBProcessor, modlet_
         # Display database statistics
         # db_processor.display_db_statistics()        
 
+        debug("Validating modlet info")
+        for key, option in (('Name', 'name'), ('Author', 'author'), ('Description', 'desc'), ('Version', 'ver'), ('Website', 'url')):
+            if combined_modlet_info[key] is None:
+                error(f"Modlet {key} is None. Please provide a value for --modlet-{option}")
+                raise ValueError(f"Modlet {key} cannot be None")
+
         # ModletWriter is already initialized in the setup_environment function
         modlet_writer.write_modlet(combined_modlet_info)
         
@@ -196,48 +205,6 @@ def run_modlet_combiner(args: Dict[str, Any], db_processor: DBProcessor, modlet_
     perform_file_operations(args)
     cleanup_logs()
 
-def process_modlets(args: Dict[str, Any]) -> None:
-    """Find and process modlets."""
-    debug("Starting process_modlets function")
-    source_path = args['source_path']
-    debug(f"Processing modlets from: {source_path}")
-
-    additional_skip_dirs = args.get('skip_dirs', '').split(',') if args.get('skip_dirs') else None
-    modlet_finder = ModletFinder(args['source_path'], additional_skip_dirs)
-    debug("Locating ModInfo.xml files")
-    modlets = modlet_finder.find_modlets()
-    debug(f"Found {len(modlets)} modlets")
-    
-    debug("Processing files")
-    file_locator.process_files()  # Remove the 'files' argument
-
-    if args['combine']:
-        debug("Combining modlets...")
-        db_processor = DBProcessor()  # Create an instance of DBProcessor
-        modlet_writer = ModletWriter(output_path, db_processor, args)
-        modlet_info = {
-            'name': args['modlet_name'],
-            'author': args['modlet_author'],
-            'description': args['modlet_desc'],
-            'version': args['modlet_ver'],
-            'website': args['modlet_url']
-        }
-        
-        debug("Validating modlet info")
-        for key, value in modlet_info.items():
-            if value is None:
-                error(f"Modlet {key} is None. Please provide a value for --modlet-{key}")
-                raise ValueError(f"Modlet {key} cannot be None")
-        
-        try:
-            debug("Writing combined modlet")
-            modlet_writer.write_modlet(modlet_info)
-            debug("Modlets combined successfully")
-        except Exception as e:
-            error(f"Error writing combined modlet: {str(e)}")
-            error(f"Traceback: {traceback.format_exc()}")
-            raise
-
 def perform_file_operations(args: Dict[str, Any]) -> None:
     """Perform actual file operations if not in dry run mode."""
     debug("Starting perform_file_operations")
@@ -246,9 +213,17 @@ def perform_file_operations(args: Dict[str, Any]) -> None:
         pass
 
 def cleanup_logs() -> None:
-    """Periodically delete old logs."""
-    if time.time() % 86400 < 300:  # Run once a day (within a 5-minute window)
-        delete_old_logs()
+    """Delete old logs at most once a day, tracked by the modification time of a marker file."""
+    log_dir = os.path.dirname(get_config('LOG_FILE', 'modlet_combiner.log')) or '.'
+    marker = os.path.join(log_dir, '.last_cleanup')
+    try:
+        if time.time() - os.stat(marker).st_mtime <= 86400:
+            return
+    except FileNotFoundError:
+        pass
+    delete_old_logs()
+    open(marker, 'a').close()
+    os.utime(marker)
 
 def check_and_update_dependencies(args: Dict[str, Any]) -> None:
     """Check and update dependencies if necessary."""
@@ -277,7 +252,17 @@ class SQLCompleter:
 
     def __init__(self, db_processor):
         self.db_processor = db_processor
+        self.refresh_tables()
+
+    def refresh_tables(self):
+        """Re-read the table names and rebuild the completion index. Called after DDL statements."""
         self.all_words = self.keywords + self.get_table_names() + list(CLI_ALIASES.keys())
+        self._index_words()
+
+    def _index_words(self):
+        """Sort the words case-insensitively so completions can be found with bisect."""
+        self._sorted = sorted(self.all_words, key=str.lower)
+        self._lower = [word.lower() for word in self._sorted]
 
     def get_table_names(self):
         cursor = self.db_processor.conn.cursor()
@@ -285,14 +270,17 @@ class SQLCompleter:
         return [row[0] for row in cursor.fetchall()]
 
     def complete(self, text, state):
-        results = [x for x in self.all_words if x.lower().startswith(text.lower())] + [None]
-        return results[state]
+        prefix = text.lower()
+        lo = bisect.bisect_left(self._lower, prefix)
+        hi = bisect.bisect_left(self._lower, prefix + '\uffff')
+        return self._sorted[lo + state] if lo + state < hi else None
 
 def run_sqlite_cli(db_processor: DBProcessor):
     """Run an interactive SQLite CLI."""
     print("Entering SQLite CLI mode. Type 'exit' to quit.")
     print("Available aliases:", ", ".join(CLI_ALIASES.keys()))
     
+    page_size = int(get_config('CLI_PAGE_SIZE', 200))
     completer = SQLCompleter(db_processor)
     readline.set_completer(completer.complete)
     readline.parse_and_bind('tab: complete')
@@ -318,13 +306,24 @@ def run_sqlite_cli(db_processor: DBProcessor):
             
             cursor = db_processor.conn.cursor()
             cursor.execute(query)
-            results = cursor.fetchall()
-            if results:
+            # Results are fetched and printed a page at a time to keep memory bounded
+            rows = cursor.fetchmany(page_size)
+            if rows:
                 headers = [description[0] for description in cursor.description]
-                print(tabulate(results, headers=headers, tablefmt="grid"))
+                if len(rows) < page_size:
+                    print(tabulate(rows, headers=headers, tablefmt="grid"))
+                else:
+                    # Large results use the lighter "simple" format, with headers on the first page only
+                    while rows:
+                        print(tabulate(rows, headers=headers, tablefmt="simple"))
+                        headers = ()
+                        rows = cursor.fetchmany(page_size)
             else:
                 print("Query executed successfully.")
             db_processor.conn.commit()
+            # Only schema changes can add or remove completable table names
+            if query.lstrip().upper().startswith(('CREATE', 'DROP', 'ALTER')):
+                completer.refresh_tables()
         except sqlite3.Error as e:
             print(f"SQLite error: {e}")
         except Exception as e:
@@ -9,6 +9,7 @@ Classes that call this class:
 Methods called from this class:
     - find_modlets: Called from the main script
     - get_summary: Called from the main script
+    - refresh: Called to force the next find_modlets to rescan the source path
 
 Visual map:
 [modlet_finder.py] -> [File System]
@@ -18,67 +19,145 @@ Visual map:
 """
 
 import os
-import xml.etree.ElementTree as ET
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+try:
+    from lxml import etree as ET
+    _HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _HAS_LXML = False
 from typing import List, Dict, Optional, Any
-from .mc_logger import info, error, warning, debug
+from .mc_logger import info, error, warning, debug, is_debug
 from .db_processor import DBProcessor
 from .file_locator import FileLocator
 from .configuration import get_config, versioned
-import hashlib
+
+# Separator logged before each ModInfo.xml in debug mode
+_BANNER = "[ModletFinder] " + "#" * 60
+
+# lxml parsers can be reused across documents
+_parser = ET.XMLParser(huge_tree=False) if _HAS_LXML else None
 
 @versioned("1.3.3")
 class ModletFinder:
+    # ModInfo.xml child tags and the modlet_info keys they fill
+    _FIELDS = {'Name': 'name', 'Description': 'description', 'Author': 'author', 'Version': 'version', 'Website': 'website'}
+    _EMPTY_INFO = dict.fromkeys(_FIELDS.values(), '')
+
     def __init__(self, source_path: str, additional_skip_dirs: Optional[List[str]] = None):
         self.source_path = os.path.abspath(source_path)
-        self.skip_dirs = set(['.git', '__pycache__'] + (additional_skip_dirs or []))
         self.db_processor = DBProcessor()
         self.file_locator = FileLocator([self.source_path])
-        self.skip_directories = get_config('SKIP_DIRECTORIES', '.git,__pycache__,CombinedModlet').split(',')
-        if additional_skip_dirs:
-            self.skip_directories.extend(additional_skip_dirs)
+        skips = set(s.strip() for s in get_config('SKIP_DIRECTORIES', '.git,__pycache__,CombinedModlet').split(','))
+        skips.update(additional_skip_dirs or ())
+        self.skip_directories = frozenset(skips)
+        # Result of the last find_modlets() walk; cleared by refresh()
+        self._modlets_cache = None
 
     def find_modlets(self) -> List[Dict[str, str]]:
         """
         Search for ModInfo.xml files and return a list of modlet information.
 
+        The tree is only walked and stored once; later calls return the same list until refresh() is called.
+
         Returns:
             List[Dict[str, str]]: A list of dictionaries containing modlet information
         """
+        if self._modlets_cache is not None:
+            return self._modlets_cache
+
+        located = []
+        for root in self._walk():
+            modinfo_path = os.path.join(root, 'ModInfo.xml')
+            if is_debug():
+                debug(_BANNER)
+                debug("[ModletFinder] Found ModInfo.xml at: %s", modinfo_path)
+            modlet_info = self._parse_modinfo(modinfo_path)
+            if modlet_info:
+                located.append((root, modlet_info))
+
+        # Modlets are located and parsed on worker threads, while this thread stores them in
+        # walk order; SQLite writes stay on the thread that owns the connection. Only modlets
+        # whose files were stored are returned.
         modlets = []
-        for root, dirs, files in os.walk(self.source_path):
-            # Remove directories to skip from the dirs list
-            dirs[:] = [d for d in dirs if d not in self.skip_directories]
-
-            if 'ModInfo.xml' in files:
-                modinfo_path = os.path.join(root, 'ModInfo.xml')
-                debug(f"[ModletFinder] ############################################################")
-                debug(f"[ModletFinder] Found ModInfo.xml at: {modinfo_path}")
-                modlet_info = self._parse_modinfo(modinfo_path)
-                if modlet_info:
+        max_workers = int(get_config('SCAN_THREADS', os.cpu_count() or 4))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            submit = lambda item: (item, pool.submit(self._process_modlet_files, *item))
+            remaining = iter(located)
+            # Keep a bounded number of parsed modlets waiting to be stored
+            in_flight = deque(map(submit, itertools.islice(remaining, max_workers * 2)))
+            while in_flight:
+                (root, modlet_info), future = in_flight.popleft()
+                in_flight.extend(map(submit, itertools.islice(remaining, 1)))
+                # Each modlet's files are loaded in a single transaction
+                try:
+                    results = future.result()
+                    self.db_processor.begin()
+                    self.file_locator.store_files(results)
+                    self.db_processor.commit()
                     modlets.append(modlet_info)
-                    try:
-                        self.db_processor.store_modlet_info(modlet_info)
-                        self._process_modlet_files(root, modlet_info)
-                    except Exception as e:
-                        error(f"Error storing modlet info for {modinfo_path}: {str(e)}")
+                except Exception as e:
+                    self.db_processor.rollback()
+                    error(f"Error storing modlet info for {os.path.join(root, 'ModInfo.xml')}, skipping it: {str(e)}")
 
-        debug(f"[ModletFinder] Total modlets found & processed: {len(modlets)}")
+        self.db_processor.store_modlet_infos_bulk(modlets)
+
+        debug(f"[ModletFinder] Total modlets found: {len(located)}, processed: {len(modlets)}")
         
+        self._modlets_cache = modlets
         return modlets
 
+    def refresh(self) -> None:
+        """Forget the cached find_modlets() result so the next call walks the source path again."""
+        self._modlets_cache = None
+
+    def _walk(self):
+        """
+        Walk the source path depth-first and yield each directory that contains a ModInfo.xml file.
+
+        Directories are visited in the same order as os.walk, skipping self.skip_directories
+        and not following symlinked directories.
+        """
+        skip_directories = self.skip_directories
+        frontier = deque([self.source_path])
+        while frontier:
+            path = frontier.pop()
+            subdirs = []
+            has_modinfo = False
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        # Names are checked first so skipped entries never need an is_dir() call
+                        name = entry.name
+                        if name in skip_directories:
+                            continue
+                        if name == 'ModInfo.xml':
+                            has_modinfo = True
+                        elif entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+            except OSError as e:
+                warning(f"[ModletFinder] Unable to scan directory {path}: {str(e)}")
+                continue
+            if has_modinfo:
+                yield path
+            # Pushed in reverse so the first subdirectory is visited next
+            frontier.extend(reversed(subdirs))
+
     def _process_modlet_files(self, root, modlet_info):
-        debug(f"[ModletFinder] Processing files for modlet: {modlet_info['name']}")
+        """Locate and parse a modlet's files. Runs on a worker thread and returns the parse_files results."""
+        if is_debug():
+            debug(f"[ModletFinder] Processing files for modlet: {modlet_info['name']}")
         
         # Locate XML files within this modlet's directory, explicitly excluding ModInfo.xml
-        xml_files = self.file_locator.locate_files('.xml', path=root, exclude=["ModInfo.xml"])
+        self.file_locator.locate_files('.xml', path=root, exclude=["ModInfo.xml"])
         
-        for xml_file in xml_files:
-            self.file_locator.process_files(modlet_info["name"], modlet_info["unique_id"], xml_file)
-        
-        # Process Localization.txt files within this modlet's directory
-        localization_files = self.file_locator.locate_files('Localization.txt', path=root)
-        for loc_file in localization_files:
-            self.file_locator.process_files(modlet_info["name"], modlet_info["unique_id"], loc_file)
+        # Locate Localization.txt files within this modlet's directory
+        self.file_locator.locate_files('Localization.txt', path=root)
+
+        # Parse all of the modlet's files in one pass; modlets themselves already run in parallel
+        return self.file_locator.parse_files(modlet_info["name"], modlet_info["unique_id"], root)
 
     def _parse_modinfo(self, modinfo_path: str) -> Dict[str, str]:
         """
@@ -91,25 +170,22 @@ class ModletFinder:
             Dict[str, str]: A dictionary containing modlet information
         """
         try:
-            tree = ET.parse(modinfo_path)
+            tree = ET.parse(modinfo_path, _parser)
             root = tree.getroot()
             
-            modlet_info = {
-                'name': root.find('Name').get('value') if root.find('Name') is not None else '',
-                'description': root.find('Description').get('value') if root.find('Description') is not None else '',
-                'author': root.find('Author').get('value') if root.find('Author') is not None else '',
-                'version': root.find('Version').get('value') if root.find('Version') is not None else '',
-                'website': root.find('Website').get('value') if root.find('Website') is not None else ''
-            }
+            # Pick up every field in one pass over the children
+            modlet_info = self._EMPTY_INFO.copy()
+            fields = self._FIELDS
+            for child in root:
+                key = fields.get(child.tag)
+                if key:
+                    modlet_info[key] = child.get('value') or ''
             
-            # Generate unique_id
-            unique_id = hashlib.md5(f"{modlet_info['name']}_{modlet_info['version']}".encode()).hexdigest()
-            modlet_info['unique_id'] = unique_id
-
-            # Ensure no None values are in the dictionary
-            modlet_info = {k: v if v is not None else '' for k, v in modlet_info.items()}
+            # Generate unique_id the same way store_modlet_info does
+            modlet_info['unique_id'] = self.db_processor.generate_unique_id(modlet_info)
             
-            debug(f"[ModletFinder] Parsed ModInfo.xml at {modinfo_path}: {modlet_info}")
+            if is_debug():
+                debug(f"[ModletFinder] Parsed ModInfo.xml at {modinfo_path}: {modlet_info}")
             
             return modlet_info
         except ET.ParseError as e:
@@ -16,18 +16,45 @@ Visual map:
                    -> [xml_writer.py]
 """
 
+import io
 import os
 import re
 import logging
 import textwrap
+from concurrent.futures import ThreadPoolExecutor
 from tabulate import tabulate
-import xml.etree.ElementTree as ET
-import xml.dom.minidom as minidom
+from xml.sax.saxutils import escape
 from typing import Dict, Any, List
 from .db_processor import DBProcessor
 from .xml_writer import XMLWriter
 from .mc_logger import info, error, warning, debug
-from .configuration import versioned, get_config, QUOTED_COLUMNS, EXPECTED_HEADER
+from .configuration import versioned, get_config, QUOTED_COLUMNS, EXPECTED_HEADER, LOCALIZATION_DB_COLUMNS
+
+# Localization values that must be quoted to survive a round trip through csv.reader
+_NEEDS_QUOTES = re.compile(r'[",\r\n]')
+
+def _quote_csv(value: str) -> str:
+    """Wrap a Localization value in quotes, doubling any quotes inside it."""
+    return '"' + value.replace('"', '""') + '"'
+
+# First level of indentation inside <config>, removed by post_process_xml_files
+_STRIP_INDENT = re.compile(rb'(?m)^  ')
+
+# One ModInfo.xml property, written by _write_modinfo_xml
+_MODINFO_LINE = '\t<{0} value="{1}"/>'
+# Attribute escapes applied by ElementTree and lxml when they serialize attribute values
+_ATTR_ENTITIES = {'"': '&quot;', '\n': '&#10;', '\r': '&#13;', '\t': '&#9;'}
+
+def _escape_attr(value: str) -> str:
+    """Escape a ModInfo.xml attribute value."""
+    return escape(value, _ATTR_ENTITIES)
+
+# Comments written around each block of a combined XML file, filled in with the modlet name
+_BLOCK_START = "<!-- Start XML_Block: %s --> "
+_BLOCK_END = " <!-- End XML_Block: %s -->"
+
+# Metadata used for blocks whose stored entry cannot be found, as returned by get_xml_metadata
+UNKNOWN_METADATA = {'modlet_name': 'Unknown', 'full_path': 'Unknown'}
 
 @versioned("1.3.3")
 class ModletWriter:
@@ -39,6 +66,9 @@ class ModletWriter:
         self.logger = logging.getLogger('7DTD-ModletCombiner')
         self.file_xml_block_counts = {}  # New attribute to store XML block counts
         self.modlet_info = None  # Initialize modlet_info as None
+        self._xml_data_cache = None  # XML data of the current build, set by write_modlet
+        # Output files are written in one call each through a large buffer
+        self.write_buffering = int(get_config('WRITE_BUFFER_SIZE', 1 << 20))
 
     def _get_output_path(self, provided_output_path: str) -> str:
         """
@@ -100,6 +130,8 @@ class ModletWriter:
         """
         self.modlet_info = modlet_info  # Store modlet_info as an attribute
         try:
+            # Read the XML data once per build; shared by _write_xml_files and display_statistics
+            self._xml_data_cache = self.db_processor.get_xml_data('', '', '')
             self._create_output_directory()
             self._write_modinfo_xml(modlet_info)
             self._write_localization_file()
@@ -110,6 +142,12 @@ class ModletWriter:
             error(f"Error writing combined modlet: {str(e)}")
             raise
 
+    def _get_xml_data(self) -> Dict[str, Dict[str, List[str]]]:
+        """Return the XML data read at the start of write_modlet, or read it now if there is none."""
+        if self._xml_data_cache is None:
+            self._xml_data_cache = self.db_processor.get_xml_data('', '', '')
+        return self._xml_data_cache
+
     def _create_output_directory(self) -> None:
         """
         Create the output directory and Config folder if they don't exist.
@@ -130,67 +168,54 @@ class ModletWriter:
         """
         try:
             mod_info_path = os.path.join(self.output_path, 'ModInfo.xml')
-            root = ET.Element("xml")
+            # ModInfo.xml has a small fixed layout, so it is formatted directly from a template
+            # with the same escaping and indentation a serialized tree would have
+            lines = ['<?xml version="1.0" encoding="UTF-8" ?>', '<xml>']
 
             # Add Name without spaces
-            name_elem = ET.SubElement(root, "Name")
-            name_elem.set("value", modlet_info['Name'].replace(" ", "_"))
+            lines.append(_MODINFO_LINE.format("Name", _escape_attr(modlet_info['Name'].replace(" ", "_"))))
 
             # Add DisplayName with spaces
-            display_name_elem = ET.SubElement(root, "DisplayName")
-            display_name_elem.set("value", modlet_info['Name'])
+            lines.append(_MODINFO_LINE.format("DisplayName", _escape_attr(modlet_info['Name'])))
 
             # Add Website
-            website_elem = ET.SubElement(root, "Website")
-            website_elem.set("value", modlet_info.get('Website', ''))
+            lines.append(_MODINFO_LINE.format("Website", _escape_attr(modlet_info.get('Website', ''))))
 
             for key, value in modlet_info.items():
                 if key not in ['Name', 'Website']:  # Skip Name and Website as we've already added them
-                    element = ET.SubElement(root, key)
-                    element.set("value", str(value))
-
-            # Convert to string and pretty print
-            xml_str = ET.tostring(root, encoding='unicode')
-            dom = minidom.parseString(xml_str)
-            pretty_xml = dom.toprettyxml(indent="\t")
+                    lines.append(_MODINFO_LINE.format(key, _escape_attr(str(value))))
 
-            # Remove extra newlines that minidom adds
-            pretty_xml = '\n'.join([line for line in pretty_xml.split('\n') if line.strip()])
+            lines.append('</xml>')
+            pretty_xml = '\n'.join(lines)
 
-            # Add XML declaration manually to ensure it's on a single line
-            pretty_xml = '<?xml version="1.0" encoding="UTF-8" ?>\n' + pretty_xml[pretty_xml.index('<xml'):]
-
-            with open(mod_info_path, 'w', encoding='utf-8') as f:
+            with open(mod_info_path, 'w', encoding='utf-8', buffering=self.write_buffering) as f:
                 f.write(pretty_xml)
 
             debug(f"[ModletWriter] Wrote ModInfo.xml: {mod_info_path}")
-        except ET.ParseError as e:
-            error(f"Error creating ModInfo.xml: {str(e)}")
-            raise
         except IOError as e:
             error(f"Error writing ModInfo.xml: {str(e)}")
             raise
 
     def _write_localization_file(self):
-        localization_data = self.db_processor.get_localization_data('', '')
-        if localization_data:
+        columns = self.db_processor.get_localization_columns('', '', LOCALIZATION_DB_COLUMNS)
+        if columns['key']:
             localization_file_path = os.path.join(self.output_path, 'Config/Localization.txt')
             try:
-                with open(localization_file_path, 'w', encoding='utf-8') as f:
+                with open(localization_file_path, 'w', encoding='utf-8', buffering=self.write_buffering) as f:
                     # Write the static header
                     f.write(','.join(EXPECTED_HEADER) + '\n')
                     
-                    # Write each localization entry
-                    for entry in localization_data:
-                        line_parts = []
-                        for column in EXPECTED_HEADER:
-                            value = entry.get(column.lower(), '')  # Use lowercase for dictionary keys
-                            if value and column in QUOTED_COLUMNS:
-                                value = f'"{value}"'  # Wrap in quotes if non-empty and in QUOTED_COLUMNS
-                            line_parts.append(value)
-                        
-                        line = ','.join(line_parts) + '\n'
-                        f.write(line)
+                    # Quote whole columns at once: non-empty values in QUOTED_COLUMNS are always quoted, other
+                    # values only when they hold a delimiter, quote or line break; embedded quotes are doubled
+                    values = []
+                    for column, db_column in zip(EXPECTED_HEADER, LOCALIZATION_DB_COLUMNS):
+                        if column in QUOTED_COLUMNS:
+                            values.append([_quote_csv(value) if value else value for value in columns[db_column]])
+                        else:
+                            values.append([_quote_csv(value) if _NEEDS_QUOTES.search(value) else value for value in columns[db_column]])
+
+                    # Write every localization entry with a single call
+                    f.write(''.join([','.join(line_parts) + '\n' for line_parts in zip(*values)]))
                 
                 debug(f"[ModletWriter] Wrote localization file: {localization_file_path}")
             except UnicodeEncodeError as e:
@@ -201,53 +226,87 @@ class ModletWriter:
     def _write_xml_files(self) -> None:
         """
         Write all combined XML files.
+
+        Each file is assembled and written on a thread pool. Block metadata is read from the
+        database up front, so the workers never touch the connection.
         """
         try:
-            xml_data = self.db_processor.get_xml_data('', '', '')
+            xml_data = self._get_xml_data()
             debug(f"Retrieved XML data for {len(xml_data)} files")
-            
-            for short_path, content in xml_data.items():
-                file_path = os.path.join(self.output_path, 'Config', short_path)
-                os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                
-                combined_content = []
-                xml_block_count = 0
-                for outer_tag, tag_contents in content.items():
-                    for tag_content in tag_contents:
-                        # Get the modlet name for this specific content
-                        modlet_name = self.db_processor.get_xml_metadata(short_path, outer_tag, tag_content)['modlet_name']
-                        
-                        combined_content.append(f"<!-- Start XML_Block: {modlet_name} -->")
-                        combined_content.append(tag_content)
-                        combined_content.append(f"<!-- End XML_Block: {modlet_name} -->")
-                        
-                        xml_block_count += 1
-                
-                full_content = f"<config>\n{' '.join(combined_content)}\n</config>"
-                
-                debug(f"Writing {len(full_content)} characters to {file_path}")
-                debug(f"Content preview: {full_content[:100]}...")
-                
-                self.xml_writer.write(file_path, full_content)
-                self.file_xml_block_counts[short_path] = xml_block_count
+
+            # Metadata for every block of every file, fetched in one query
+            metadata = self.db_processor.get_all_xml_metadata()
+            os.makedirs(os.path.join(self.output_path, 'Config'), exist_ok=True)
+
+            write_one = lambda item: self._write_xml_file(item[0], item[1], metadata.get(item[0], {}))
+            max_workers = int(get_config('XML_WRITE_THREADS', min(32, (os.cpu_count() or 1) * 2)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for short_path, xml_block_count in executor.map(write_one, xml_data.items()):
+                    self.file_xml_block_counts[short_path] = xml_block_count
 
             self.xml_writer.validate_all_files()
-            self.xml_writer.check_total_filesize()
         except Exception as e:
             error(f"Error writing XML files: {str(e)}")
             raise
 
+    def _write_xml_file(self, short_path: str, content: Dict[str, List[str]], metadata: Dict) -> tuple:
+        """
+        Assemble and write one combined XML file. Runs on a worker thread.
+
+        Args:
+            short_path (str): File name of the XML file inside Config
+            content (Dict[str, List[str]]): Stored blocks of the file, keyed by outer tag
+            metadata (Dict): The file's block metadata, as returned by get_xml_metadata_bulk
+
+        Returns:
+            tuple: The short path and the number of XML blocks written
+        """
+        file_path = os.path.join(self.output_path, 'Config', short_path)
+
+        # Blocks are written straight into one buffer, separated by a single space
+        buffer = io.StringIO()
+        buffer.write("<config>\n")
+        separator = ''
+        xml_block_count = 0
+        # Start and end comments are built once per modlet and reused for all of its blocks
+        markers = {}
+        for outer_tag, tag_contents in content.items():
+            for tag_content in tag_contents:
+                # Get the modlet name for this specific content
+                modlet_name = metadata.get((outer_tag, tag_content), UNKNOWN_METADATA)['modlet_name']
+                marker = markers.get(modlet_name)
+                if marker is None:
+                    marker = markers[modlet_name] = (_BLOCK_START % modlet_name, _BLOCK_END % modlet_name)
+
+                buffer.write(separator)
+                buffer.write(marker[0])
+                buffer.write(tag_content)
+                buffer.write(marker[1])
+                separator = ' '
+
+                xml_block_count += 1
+
+        buffer.write("\n</config>")
+        full_content = buffer.getvalue()
+
+        debug("Writing %d characters to %s", len(full_content), file_path)
+        debug("Content preview: %.100s...", full_content)
+
+        self.xml_writer.write(file_path, full_content)
+        return short_path, xml_block_count
+
     def display_statistics(self):
         """
         Display statistics about the combined modlet files.
         """
         stats = []
-        db_xml_data = self.db_processor.get_xml_data('', '', '')
+        db_xml_data = self._get_xml_data()
+        # One scan of the Config directory instead of an exists() and getsize() per file
+        file_sizes = dict(self._scan_file_sizes(os.path.join(self.output_path, 'Config'), recursive=False))
 
         for short_path, content in db_xml_data.items():
-            file_path = os.path.join(self.output_path, 'Config', short_path)
-            if os.path.exists(file_path):
-                file_size = os.path.getsize(file_path)
+            file_size = file_sizes.get(short_path)
+            if file_size is not None:
                 db_size = sum(len(''.join(c)) for c in content.values())
                 db_xml_block_count = sum(len(c) for c in content.values())
                 file_xml_block_count = self.file_xml_block_counts.get(short_path, "Unknown")
@@ -274,35 +333,33 @@ class ModletWriter:
     def post_process_xml_files(self):
         """
         Remove only the first level of indentation from all XML files in the output directory.
+
+        Each file is read once, the lines between the <config> and </config> lines are
+        dedented with a single regex pass, and the result is written back once.
         """
-        config_dir = os.path.join(self.output_path, 'Config')
-        for filename in os.listdir(config_dir):
-            if filename.endswith('.xml'):
-                file_path = os.path.join(config_dir, filename)
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    lines = file.readlines()
-                
-                # Process lines to remove only the first level of indentation
-                processed_lines = []
-                in_config = False
-                for line in lines:
-                    if '<config>' in line:
-                        in_config = True
-                        processed_lines.append(line)
-                    elif '</config>' in line:
-                        in_config = False
-                        processed_lines.append(line)
-                    elif in_config:
-                        # Remove only the first two spaces of indentation if present
-                        processed_lines.append(line[2:] if line.startswith('  ') else line)
-                    else:
-                        processed_lines.append(line)
-                
-                # Write the processed content back to the file
-                with open(file_path, 'w', encoding='utf-8') as file:
-                    file.writelines(processed_lines)
-                
-                debug(f"Post-processed {filename}")
+        with os.scandir(os.path.join(self.output_path, 'Config')) as entries:
+            xml_files = [entry for entry in entries if entry.name.endswith('.xml')]
+        for entry in xml_files:
+            with open(entry.path, 'rb') as file:
+                data = file.read()
+
+            # Only the lines after the <config> line and before the </config> line are touched
+            start = data.find(b'<config>')
+            if start == -1:
+                continue
+            start = data.find(b'\n', start) + 1
+            end = data.find(b'</config>', start) if start else -1
+            if start and end != -1:
+                end = data.rfind(b'\n', start, end) + 1 or start
+                data = data[:start] + _STRIP_INDENT.sub(b'', data[start:end]) + data[end:]
+            elif start:
+                data = data[:start] + _STRIP_INDENT.sub(b'', data[start:])
+
+            # Write the processed content back to the file
+            with open(entry.path, 'wb', buffering=self.write_buffering) as file:
+                file.write(data)
+
+            debug("Post-processed %s", entry.name)
 
     def combined_modlet_stats(self):
         """
@@ -342,15 +399,37 @@ class ModletWriter:
             print("\nUnable to retrieve component modlet information.")
 
         # Table 3: Destination File Sizes
-        file_sizes = []
-        for root, dirs, files in os.walk(self.output_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                size = os.path.getsize(file_path)
-                file_sizes.append([file, f"{size:,} bytes"])
+        file_sizes = [[file, f"{size:,} bytes"] for file, size in self._scan_file_sizes(self.output_path)]
         print("\nDestination File Sizes:")
         print(tabulate(file_sizes, headers=["File", "Size"], tablefmt="grid"))
 
+    def _scan_file_sizes(self, directory: str, recursive: bool = True):
+        """
+        Yield (file name, size) for the files in a directory, in os.walk order, with one stat per file.
+
+        Args:
+            directory (str): The directory to scan
+            recursive (bool): Also scan subdirectories
+        """
+        subdirs = []
+        files = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # Like os.walk, symlinked directories are neither listed nor followed
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif entry.is_file():
+                        files.append((entry.name, entry.stat().st_size))
+        except OSError as e:
+            warning(f"[ModletWriter] Unable to scan directory {directory}: {str(e)}")
+            return
+        yield from files
+        if recursive:
+            for subdir in subdirs:
+                yield from self._scan_file_sizes(subdir)
+
     def write(self) -> None:
         """
         Write all combined modlet files.
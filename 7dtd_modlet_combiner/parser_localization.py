@@ -7,7 +7,8 @@ Classes that call this class:
     - FileLocator
 
 Methods called from this class:
-    - parse: Called from FileLocator
+    - parse: Parses a file and stores the result
+    - parse_rows: Called from FileLocator worker threads; parses without storing
 
 Visual map:
 [parser_localization.py] <- [file_locator.py]
@@ -15,10 +16,11 @@ Visual map:
 """
 
 import base64
-from typing import List
+import operator
+from typing import Dict, List
 from .mc_logger import info, warning, error, debug
 from .db_processor import DBProcessor
-from .configuration import get_config, versioned
+from .configuration import get_config, versioned, LOCALIZATION_DB_COLUMNS
 import csv
 from io import StringIO
 
@@ -38,42 +40,61 @@ class LocalizationParser:
             unique_id (str): Unique identifier for the modlet
             content (str, optional): Content of the Localization.txt file
         """
-        
+        # Store the whole file with one executemany in a single transaction, rather than
+        # leaving its rows buffered until the next batch fills up
+        self.db_processor.store_localization_rows(self.parse_rows(file_path, modlet_name, unique_id, content))
+        self.db_processor.flush()
+
+    def parse_rows(self, file_path, modlet_name, unique_id, content=None) -> List[Dict[str, str]]:
+        """
+        Parse a Localization.txt file into the rows stored by parse(), without touching the database.
+
+        Args:
+            file_path (str): Full path to the Localization.txt file
+            modlet_name (str): Name of the modlet
+            unique_id (str): Unique identifier for the modlet
+            content (str, optional): Content of the Localization.txt file
+
+        Returns:
+            List[Dict[str, str]]: One store_localization_rows entry per line, keyed by database column
+        """
         if content is None:
-            with open(file_path, 'r', encoding=self.encoding) as file:
-                content = file.read()
-        
-        csv_reader = csv.reader(StringIO(content), delimiter=',', quotechar='"')
-        
+            # Stream the rows straight from the file instead of reading it into one string first
+            with open(file_path, 'r', encoding=self.encoding, newline='', buffering=1 << 20) as file:
+                return self._parse_reader(csv.reader(file, delimiter=',', quotechar='"'), file_path, modlet_name, unique_id)
+
+        return self._parse_reader(csv.reader(StringIO(content), delimiter=',', quotechar='"'), file_path, modlet_name, unique_id)
+
+    def _parse_reader(self, csv_reader, file_path, modlet_name, unique_id) -> List[Dict[str, str]]:
+        """Build the parse_rows entries from a csv.reader over a Localization.txt file."""
         short_path = self._get_short_path(file_path)
         
         # Skip the header row
         next(csv_reader, None)
         
+        # Every row shares the same file columns, and 'value' defaults to the English text
+        keys = LOCALIZATION_DB_COLUMNS + ['modlet_name', 'unique_id', 'full_path', 'short_path', 'value']
+        file_columns = (modlet_name, unique_id, file_path, short_path)
+        english = LOCALIZATION_DB_COLUMNS.index('english')
+
+        rows = []
+        line_number = 1
         for line_number, row in enumerate(csv_reader, 2):  # Start from 2 to account for header
-            if not row:
-                debug(f"[LocalizationParser] Skipping empty line {line_number} in file {file_path}")
-                continue
-            
-            if row[0].startswith('#'):
-                debug(f"[LocalizationParser] Skipping comment line {line_number} in file {file_path}")
+            # Complete entries are the common case, so they are checked for first
+            if len(row) >= 20 and not row[0].startswith('#'):
+                rows.append(dict(zip(keys, (*row[:20], *file_columns, row[english]))))
                 continue
-            
-            if len(row) < 20:  # Ensure we have all expected columns
+
+            if not row:
+                debug("[LocalizationParser] Skipping empty line %d in file %s", line_number, file_path)
+            elif row[0].startswith('#'):
+                debug("[LocalizationParser] Skipping comment line %d in file %s", line_number, file_path)
+            else:  # Ensure we have all expected columns
                 warning(f"[LocalizationParser] Line {line_number} in file {file_path} has insufficient columns: {row}")
-                continue
-            
-            key, file, type, used_in_main_menu, no_translate, english, *other_languages = row[:20]
-            
-            # Store the localization data
-            self.db_processor.store_localization_data(
-                modlet_name, unique_id, file_path, short_path,
-                file, used_in_main_menu, no_translate, type, key,
-                english, *other_languages  # Use English as the default value
-            )
 
         # Add a summary at the end of parsing
-        debug(f"[LocalizationParser] Finished parsing {file_path}. Processed {line_number - 1} lines.")
+        debug("[LocalizationParser] Finished parsing %s. Processed %d lines.", file_path, line_number - 1)
+        return rows
 
     def count_characters(self, content: str) -> int:
         """
@@ -130,7 +151,7 @@ class LocalizationParser:
         """
         short_path = self._get_short_path(full_path)
         stored_data = self.db_processor.get_localization_data(full_path, short_path)
-        line_count = len(stored_data.split('\n'))
+        line_count = len(stored_data)  # One stored row per line
         return f"[LocalizationParser] Parsed Localization file {full_path}: {line_count} lines stored"
 
     def merge_localization_data(self, localization_data: List[str]) -> str:
@@ -156,11 +177,8 @@ class LocalizationParser:
         if original == stored:
             return 0
         
-        # Calculate the difference
-        changes = 0
-        for i in range(min(len(original), len(stored))):
-            if original[i] != stored[i]:
-                changes += 1
+        # Count differing positions with map() instead of an indexed Python loop
+        changes = sum(map(operator.ne, original, stored))
         changes += abs(len(original) - len(stored))
         
         return (changes / max(len(original), len(stored))) * 100
@@ -7,7 +7,9 @@ Classes that call this class:
     - FileLocator
 
 Methods called from this class:
-    - parse: Called from FileLocator
+    - parse: Parses a file and stores the result
+    - parse_stream: Called from FileLocator worker threads; parses incrementally without storing
+    - parse_content: Parses XML text without storing
 
 Visual map:
 [parser_xml.py] <- [file_locator.py]
@@ -20,9 +22,31 @@ from .mc_logger import info, error, warning, debug
 from .db_processor import DBProcessor
 from .configuration import get_config, versioned
 from .utilities import shorten_text
+import io
 import logging
 import re
-from lxml import etree
+import threading
+
+try:
+    from lxml import etree
+except ImportError:  # Fall back to ElementTree for all parsing and serialization
+    etree = None
+
+# lxml when available, ElementTree otherwise; both provide the same tostring/Element API
+xml_lib = etree if etree is not None else ET
+PARSE_ERRORS = (ET.ParseError,) if etree is None else (ET.ParseError, etree.ParseError)
+
+# One reusable lxml parser per thread; FileLocator parses files on several threads at once
+_local = threading.local()
+
+def _fromstring(content: str):
+    """Parse XML text with lxml when available, dropping comments and processing instructions like ElementTree does."""
+    if etree is None:
+        return ET.fromstring(content)
+    parser = getattr(_local, 'parser', None)
+    if parser is None:
+        parser = _local.parser = etree.XMLParser(remove_comments=True, remove_pis=True, huge_tree=True)
+    return etree.fromstring(content.encode('utf-8'), parser=parser)
 
 @versioned("1.3.2")
 class XMLParser:
@@ -31,19 +55,86 @@ class XMLParser:
         self.db_processor = DBProcessor()
 
     def _read_file_with_fallback_encoding(self, file_path):
-        encodings = ['utf-8', 'latin-1', 'ascii']
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as file:
-                    return file.read()
-            except UnicodeDecodeError:
-                continue
-        
-        error(f"[XMLParser] Unable to read file {file_path} with any of the attempted encodings")
-        return None
+        # Read the file once and decode the bytes in memory; latin-1 accepts any byte
+        # sequence, so it is the only fallback needed after utf-8
+        with open(file_path, 'rb') as file:
+            data = file.read()
+        try:
+            return data.decode('utf-8')
+        except UnicodeDecodeError:
+            debug("[XMLParser] %s is not valid utf-8, decoding it as latin-1", file_path)
+            return data.decode('latin-1')
     
 
     def parse(self, file_path, modlet_name, unique_id, content=None):
+        row = self.parse_content(file_path, modlet_name, unique_id, content)
+        if row is not None:
+            self.db_processor.store_xml_data(*row)
+            debug("[XMLParser] Stored XML data for %s", file_path)
+
+    def parse_stream(self, file_path, modlet_name, unique_id, fileobj):
+        """
+        Parse an XML file incrementally from an open binary file object, without touching the database.
+
+        Each top-level block is serialized once the next one has been parsed, when its tail text
+        is known, and is then cleared, so memory stays bounded by the largest blocks rather than
+        the whole file. Blocks and their trimmed tails match parse_content. Files lxml cannot
+        stream (for example with leading whitespace before the XML declaration) are handed to
+        parse_content.
+
+        Args:
+            file_path (str): Full path to the XML file
+            modlet_name (str): Name of the modlet
+            unique_id (str): Unique identifier for the modlet
+            fileobj: File object opened in binary mode
+
+        Returns:
+            Optional[Tuple]: The store_xml_data arguments, or None if the file could not be parsed
+        """
+        if etree is None:
+            return self.parse_content(file_path, modlet_name, unique_id)
+
+        try:
+            outer_tag = None
+            blocks = []
+            depth = 0
+            # The last completed child of the root; its tail is only parsed along with the next block
+            pending = None
+            for event, elem in etree.iterparse(fileobj, events=('start', 'end'), remove_comments=True, remove_pis=True):
+                if event == 'start':
+                    if depth == 0:
+                        outer_tag = elem.tag
+                    depth += 1
+                    continue
+
+                depth -= 1
+                if depth == 1:
+                    # A direct child of the root element is complete, so the previous one's tail is too
+                    if pending is not None:
+                        blocks.append(etree.tostring(pending, encoding='unicode').strip())
+                        while elem.getprevious() is not None:
+                            del elem.getparent()[0]
+                    pending = elem
+                elif depth == 0 and pending is not None:
+                    blocks.append(etree.tostring(pending, encoding='unicode').strip())
+
+            xml_content = '\n'.join(blocks)
+            debug("[XMLParser] Parsed XML for %s", file_path)
+            debug("[XMLParser] Outer tag: %s", outer_tag)
+            debug("[XMLParser] Content preview: %.100s...", xml_content)  # Log first 100 characters of content
+
+            return (modlet_name, unique_id, file_path, self._get_short_path(file_path), outer_tag, xml_content)
+        except etree.XMLSyntaxError as e:
+            debug(f"[XMLParser] Unable to stream {file_path} ({str(e)}), parsing it from text instead")
+            return self.parse_content(file_path, modlet_name, unique_id)
+
+    def parse_content(self, file_path, modlet_name, unique_id, content=None):
+        """
+        Parse an XML file into the row stored by parse(), without touching the database.
+
+        Returns:
+            Optional[Tuple]: The store_xml_data arguments, or None if the file could not be parsed
+        """
         try:
             if content is None:
                 debug(f"[XMLParser] Reading file: {file_path}")
@@ -57,25 +148,33 @@ class XMLParser:
             if not content.startswith('<?xml'):
                 content = '<?xml version="1.0" encoding="UTF-8"?>\n' + content
 
-            root = ET.fromstring(content)
+            root = _fromstring(content)
             outer_tag = root.tag
             short_path = self._get_short_path(file_path)
 
             # Extract content inside the root tag, excluding the root tag itself
-            xml_content = '\n'.join(ET.tostring(child, encoding='unicode', method='xml').strip() for child in root)
+            xml_content = self._serialize_children(root)
             
-            debug(f"[XMLParser] Parsed XML for {file_path}")
-            debug(f"[XMLParser] Outer tag: {outer_tag}")
-            debug(f"[XMLParser] Content preview: {xml_content[:100]}...")  # Log first 100 characters of content
+            debug("[XMLParser] Parsed XML for %s", file_path)
+            debug("[XMLParser] Outer tag: %s", outer_tag)
+            debug("[XMLParser] Content preview: %.100s...", xml_content)  # Log first 100 characters of content
 
-            self.db_processor.store_xml_data(modlet_name, unique_id, file_path, short_path, outer_tag, xml_content)
-            
-            debug(f"[XMLParser] Stored XML data for {file_path}")
-        except ET.ParseError as e:
+            return (modlet_name, unique_id, file_path, short_path, outer_tag, xml_content)
+        except PARSE_ERRORS as e:
             error(f"[XMLParser] Error parsing XML file {file_path}: {str(e)}")
         except Exception as e:
             error(f"[XMLParser] Unexpected error processing XML file {file_path}: {str(e)}")
+        return None
+
+
+    def _serialize_children(self, root):
+        """
+        Serialize the children of root, one per line.
 
+        Each child is serialized on its own so it carries the namespace declarations it uses,
+        which would otherwise stay behind on the root start tag. Tail text is kept and trimmed.
+        """
+        return '\n'.join(xml_lib.tostring(child, encoding='unicode').strip() for child in root)
 
     def _get_short_path(self, full_path):
         try:
@@ -95,47 +194,6 @@ class XMLParser:
         error(f"[XMLParser] Unable to decode stored data with any of the attempted encodings")
         return None
     
-    def _validate_stored_data(self, file_path, short_path, outer_tag, original_content):
-        try:
-            stored_data = self.db_processor.get_xml_data(file_path, short_path, outer_tag)
-            if stored_data is not None:
-                try:
-                    stored_content = stored_data
-                except UnicodeDecodeError:
-                    # If decoding fails, treat stored_data as bytes
-                    stored_content = stored_data
-
-                if stored_content is not None:
-                    # Convert original_content to bytes for comparison if stored_content is bytes
-                    if isinstance(stored_content, bytes):
-                        original_content = original_content.encode('utf-8')
-
-                    if stored_content != original_content:
-                        difference_percentage = self._calculate_difference_percentage(str(original_content), str(stored_content))
-                        if difference_percentage > 10:
-                            warning(f"[XMLParser] Stored XML data for {file_path} differs by {difference_percentage:.2f}% from the original file")
-                        else:
-                            debug(f"[XMLParser] Minor difference ({difference_percentage:.2f}%) detected in stored XML data for {file_path}")
-                    else:
-                        debug(f"[XMLParser] Post-Storage Validation OK: {file_path}.")
-                else:
-                    warning(f"[XMLParser] Unable to decode or compare stored data for {file_path}. Skipping validation.")
-            else:
-                warning(f"[XMLParser] No stored data found for {file_path}")
-        except Exception as e:
-            error(f"[XMLParser] Error validating stored data for {file_path}: {str(e)}")
-
-    def _calculate_difference_percentage(self, original, stored):
-        try:
-            if original == stored:
-                return 0
-            changes = sum(1 for a, b in zip(original, stored) if a != b)
-            changes += abs(len(original) - len(stored))
-            return (changes / max(len(original), len(stored))) * 100
-        except Exception as e:
-            error(f"[XMLParser] Error calculating difference percentage: {str(e)}")
-            return 100  # Assume 100% difference in case of error
-
     def count_characters(self, content: str) -> int:
         try:
             return len(content)
@@ -148,7 +206,7 @@ class XMLParser:
             outer_tags = []
             for child in root:
                 outer_tag = child.tag
-                tag_content = ET.tostring(child, encoding='unicode')
+                tag_content = xml_lib.tostring(child, encoding='unicode')
                 outer_tags.append((outer_tag, tag_content))
             return outer_tags
         except Exception as e:
@@ -157,29 +215,49 @@ class XMLParser:
 
     def _merge_xml_content(self, existing_content: str, new_content: str) -> str:
         try:
-            existing_root = ET.fromstring(existing_content)
-            new_root = ET.fromstring(new_content)
+            existing_root = _fromstring(existing_content)
+            new_root = _fromstring(new_content)
 
-            for element in new_root:
-                existing_element = existing_root.find(element.tag)
+            # First child of each tag, as find() would return it, indexed once instead of searched per element
+            existing_index = {}
+            for child in existing_root:
+                existing_index.setdefault(child.tag, child)
+
+            for element in list(new_root):
+                existing_element = existing_index.get(element.tag)
                 if existing_element is not None:
                     existing_element.extend(element)
                 else:
                     existing_root.append(element)
+                    existing_index[element.tag] = element
 
-            return ET.tostring(existing_root, encoding='unicode')
+            return xml_lib.tostring(existing_root, encoding='unicode')
         except Exception as e:
             error(f"[XMLParser] Error merging XML content: {str(e)}")
             return existing_content
 
     def handle_namespaces(self, content: str) -> str:
         try:
-            root = ET.fromstring(content)
-            for elem in root.iter():
+            if etree is None:
+                root = ET.fromstring(content)
+                for elem in root.iter():
+                    if '}' in elem.tag:
+                        elem.tag = elem.tag.split('}', 1)[1]
+                return ET.tostring(root, encoding='unicode')
+
+            # Tags are renamed while the document is parsed, so there is no separate walk; the
+            # last element to end is the root
+            root = None
+            events = etree.iterparse(io.BytesIO(content.encode('utf-8')), events=('end',),
+                                     remove_comments=True, remove_pis=True, huge_tree=True)
+            for _, elem in events:
                 if '}' in elem.tag:
-                    elem.tag = elem.tag.split('}', 1)[1]
-            return ET.tostring(root, encoding='unicode')
-        except ET.ParseError as e:
+                    elem.tag = etree.QName(elem).localname
+                root = elem
+            # Drop the declarations the renamed tags no longer use, as ElementTree does on output
+            etree.cleanup_namespaces(root)
+            return etree.tostring(root, encoding='unicode')
+        except PARSE_ERRORS as e:
             error(f"[XMLParser] Error handling namespaces: {str(e)}")
             return content
         except Exception as e:
@@ -188,4 +266,4 @@ class XMLParser:
 
     def _extract_inner_content(self, root):
         """Extract the contents of the outer tag."""
-        return ''.join(ET.tostring(child, encoding='unicode') for child in root)
+        return ''.join(xml_lib.tostring(child, encoding='unicode') for child in root)
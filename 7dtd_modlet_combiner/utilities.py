@@ -10,6 +10,10 @@ Functions:
     - install_dependency: Attempt to install a missing dependency
     - update_dependency: Attempt to update a dependency to the latest version
     - update_all_dependencies: Update all installed dependencies
+    - get_file_hash: Calculate the SHA256 hash of a file, reusing the result while the file is unchanged
+    - clear_hash_cache: Forget the hashes remembered by get_file_hash
+    - simhash: Calculate a 64-bit SimHash signature used to estimate how similar two contents are
+    - simhash_similarity: Compare two SimHash signatures
 """
 
 import subprocess
@@ -18,6 +22,23 @@ import json
 from typing import List
 from .mc_logger import info, error, warning
 
+# Required dependencies are looked up once, when this module is loaded
+try:
+    import lxml
+    import sqlite3
+    _DEPS_OK, _DEPS_ERR = True, None
+except ImportError as e:
+    _DEPS_OK, _DEPS_ERR = False, e
+
+# Block size used when a file is hashed in Python; large blocks keep the loop short and let
+# hashlib release the GIL for most of the work
+HASH_CHUNK_SIZE = 1 << 20
+# Files larger than this are memory-mapped for hashing instead of read
+HASH_MMAP_THRESHOLD = 4 * 1024 * 1024
+
+# get_file_hash results keyed by (path, size, modification time in ns)
+_HASH_CACHE = {}
+
 
 def format_number(number: int) -> str:
     """
@@ -33,13 +54,9 @@ def format_number(number: int) -> str:
 
 def check_dependencies() -> bool:
     """Check if the required dependencies are available."""
-    try:
-        import lxml
-        import sqlite3
-        return True
-    except ImportError as e:
-        error(f"Required dependency not found: {e}")
-        return False
+    if not _DEPS_OK:
+        error(f"Required dependency not found: {_DEPS_ERR}")
+    return _DEPS_OK
 
 def shorten_text(value: str, max_length: int = 50) -> str:
     """
@@ -112,13 +129,21 @@ def update_all_dependencies() -> List[str]:
         List[str]: A list of packages that failed to update.
     """
     try:
-        output = subprocess.check_output([sys.executable, "-m", "pip", "list", "--outdated", "--format=json"])
-        outdated_packages = json.loads(output)
-        failed_updates = []
-        for package in outdated_packages:
-            if not update_dependency(package['name']):
-                failed_updates.append(package['name'])
-        return failed_updates
+        # pip's JSON listing is drained through a 64 KiB pipe buffer; stderr still reaches the console
+        output = subprocess.run([sys.executable, "-m", "pip", "list", "--outdated", "--format=json"],
+                                stdout=subprocess.PIPE, bufsize=65536, check=True).stdout
+        names = [package['name'] for package in json.loads(output)]
+        if not names:
+            return []
+        # Upgrade everything with a single pip run; only when that fails is each package
+        # retried on its own to find the ones that broke
+        try:
+            subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", *names])
+            info(f"Successfully updated {', '.join(names)}")
+            return []
+        except subprocess.CalledProcessError:
+            warning("Updating all outdated packages at once failed, retrying them one at a time")
+        return [name for name in names if not update_dependency(name)]
     except subprocess.CalledProcessError:
         error("Failed to check for outdated packages")
     return []
@@ -134,7 +159,8 @@ def is_valid_path(path: str) -> bool:
         bool: True if the path is valid and accessible, False otherwise.
     """
     import os
-    return os.path.exists(path) and os.access(path, os.R_OK)
+    # access() fails for missing paths too, so no separate exists() check is needed
+    return os.access(path, os.R_OK)
 
 def create_directory(path: str) -> bool:
     """
@@ -164,9 +190,71 @@ def get_file_hash(file_path: str) -> str:
     Returns:
         str: The SHA256 hash of the file.
     """
+    import os
+    # Files that have not changed since they were last hashed are not read again
+    st = os.stat(file_path)
+    key = (file_path, st.st_size, st.st_mtime_ns)
+    digest = _HASH_CACHE.get(key)
+    if digest is None:
+        digest = _HASH_CACHE[key] = _hash_file(file_path, st.st_size)
+    return digest
+
+def clear_hash_cache() -> None:
+    """Forget every hash remembered by get_file_hash."""
+    _HASH_CACHE.clear()
+
+def _hash_file(file_path: str, size: int) -> str:
+    """Calculate the SHA256 hash of a file of the given size."""
     import hashlib
-    sha256_hash = hashlib.sha256()
+    import mmap
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
+        # Large files are hashed straight from the page cache, without copying them into Python
+        if size > HASH_MMAP_THRESHOLD:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return hashlib.sha256(mm).hexdigest()
+            except (OSError, ValueError):
+                pass  # Not mappable; hash it with the read loop below
+        # file_digest (Python 3.11+) runs the whole read and update loop in C
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        sha256_hash = hashlib.sha256()
+        for byte_block in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
             sha256_hash.update(byte_block)
     return sha256_hash.hexdigest()
+
+def simhash(data: bytes, shingle_size: int = 4) -> int:
+    """
+    Calculate a 64-bit SimHash signature of the given data.
+
+    Each overlapping shingle of the data is hashed with blake2b and votes on the 64 bits of the
+    signature. Similar inputs produce signatures that differ in only a few bits.
+
+    Args:
+        data (bytes): The data to sign.
+        shingle_size (int, optional): The length of each shingle in bytes. Defaults to 4.
+
+    Returns:
+        int: The signature as a signed 64-bit integer, so it can be stored in an SQLite INTEGER column.
+    """
+    import hashlib
+    counts = [0] * 64
+    for i in range(max(len(data) - shingle_size + 1, 1)):
+        h = int.from_bytes(hashlib.blake2b(data[i:i + shingle_size], digest_size=8).digest(), 'little')
+        for bit in range(64):
+            counts[bit] += 1 if (h >> bit) & 1 else -1
+    signature = sum(1 << bit for bit in range(64) if counts[bit] > 0)
+    return signature - (1 << 64) if signature >= 1 << 63 else signature
+
+def simhash_similarity(first: int, second: int) -> float:
+    """
+    Estimate the similarity of two SimHash signatures.
+
+    Args:
+        first (int): The first signature.
+        second (int): The second signature.
+
+    Returns:
+        float: 1.0 for identical signatures, down to 0.0 when every bit differs.
+    """
+    return 1 - ((first ^ second) & 0xFFFFFFFFFFFFFFFF).bit_count() / 64
@@ -9,7 +9,6 @@ Classes that call this class:
 Methods called from this class:
     - write: Called from ModletWriter
     - validate_all_files: Called from ModletWriter after all files are written
-    - check_total_filesize: Called from ModletWriter after all files are written
 
 Visual map:
 ModletWriter
@@ -19,8 +18,9 @@ XMLWriter
     |
     |-- write
     |-- validate_all_files
-    |-- check_total_filesize
     |-- _validate_xml
+    |-- _validate_tree
+    |-- _validate_file
     |-- _update_file_size
     |-- ensure_file_exists
     |-- get_file_hash
@@ -29,24 +29,35 @@ XMLWriter
 """
 
 import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import xml.etree.ElementTree as ET
-import xml.dom.minidom
 from .mc_logger import info, error, warning
 from .utilities import get_file_hash
 from .configuration import get_config, versioned
 from .mc_logger import debug
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import logging
 from lxml import etree
 
+# Declaration that pretty_print drops from the content it is given
+_XML_DECLARATION = '<?xml version="1.0" ?>'
+
 @versioned("1.3.1")
 class XMLWriter:
     def __init__(self):
         self.total_size = 0
-        self.original_total_size = 0
-        self.written_files: Dict[str, int] = {}  # Store file paths and their sizes
-        self.file_char_counts: Dict[str, int] = {}  # Store character counts for each file
+        self.written_files: Dict[str, Tuple[int, int]] = {}  # Store file paths and their (size, st_mtime_ns)
+        self.file_char_counts: Dict[str, int] = defaultdict(int)  # Store the utf-8 length written to each file
         self.logger = logging.getLogger('7DTD-ModletCombiner')
+        # write() may be called from several threads; guards the size and count totals
+        self._lock = threading.Lock()
+        # One reusable lxml parser per thread; a shared parser would serialize parsing across threads
+        self._local = threading.local()
+        # Same write buffer size setting as ModletWriter
+        self.write_buffering = int(get_config('WRITE_BUFFER_SIZE', 1 << 20))
+        self._ensured_dirs = set()  # Directories already created by ensure_file_exists
 
     def write(self, file_path: str, content: str) -> None:
         """
@@ -57,18 +68,31 @@ class XMLWriter:
             content (str): XML content to write
         """
         try:
-            self.logger.debug(f"Content to write: {content[:500]}...")  # Log first 500 characters
-
-            # Pretty print the XML content
-            pretty_xml = self.pretty_print(content)
+            debug("Content to write: %.500s...", content)  # Log first 500 characters
 
-            # Write the pretty-printed XML to the file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(pretty_xml)
-
-            self._validate_xml(file_path)
-            self._update_file_size(file_path, len(pretty_xml))
-            self._update_char_count(file_path, pretty_xml)
+            # Parse once: the tree is validated in memory and pretty printed, so the written
+            # file never has to be read back and parsed again
+            try:
+                root = self._parse_wrapped(content)
+                self._validate_tree(file_path, root)
+            except etree.XMLSyntaxError as e:
+                error(f"Invalid XML in file {file_path}: {str(e)}")
+                root = None
+
+            # lxml serializes the pretty-printed tree straight into the buffered file, so the
+            # whole document is never held as one string
+            with open(file_path, 'wb', buffering=self.write_buffering) as f:
+                if root is not None:
+                    self._write_wrapped(f, root)
+                else:
+                    f.write(content.encode('utf-8'))
+                # One fstat after flushing gives both the byte count and the mtime validate_all_files compares
+                f.flush()
+                st = os.fstat(f.fileno())
+
+            with self._lock:
+                self._update_file_size(file_path, st.st_size, st.st_mtime_ns)
+                self._update_char_count(file_path, st.st_size)
 
         except ET.ParseError as e:
             error(f"Error parsing XML content for file {file_path}: {str(e)}")
@@ -77,47 +101,75 @@ class XMLWriter:
         except Exception as e:
             error(f"Unexpected error writing XML file {file_path}: {str(e)}")
 
-    def _validate_xml(self, file_path: str) -> None:
+    def _validate_tree(self, file_path: str, root) -> None:
+        """
+        Check that wrapped content parsed by _parse_wrapped forms a single XML document, as
+        _validate_xml would find once the file is written.
+        """
+        elements = [child for child in root if isinstance(child.tag, str)]
+        stray_text = (root.text or '').strip() or any((child.tail or '').strip() for child in root)
+        if len(elements) != 1 or stray_text:
+            error(f"Invalid XML in file {file_path}: content must have exactly one root element")
+        else:
+            debug("Validated XML file: %s", file_path)
+
+    def _validate_xml(self, file_path: str, content=None) -> None:
+        """
+        Check that an XML file is well-formed.
+
+        Args:
+            file_path (str): Path to the XML file
+            content (str or bytes, optional): The file's content, if the caller already has it; the
+                file is only read from disk when this is omitted
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Add root element for validation
-            #content = f"{content}"
-            
-            ET.fromstring(content)  # This will raise an exception if the XML is invalid
-            debug(f"Validated XML file: {file_path}")
-        except ET.ParseError as e:
+            # Both raise an exception if the XML is invalid
+            if content is None:
+                self._validate_file(file_path)
+            else:
+                if isinstance(content, str):
+                    content = content.encode('utf-8')
+                etree.fromstring(content, self._get_parser())
+            debug("Validated XML file: %s", file_path)
+        except etree.XMLSyntaxError as e:
             error(f"Invalid XML in file {file_path}: {str(e)}")
         except Exception as e:
             error(f"Error validating XML file {file_path}: {str(e)}")
 
-    def _update_file_size(self, file_path: str, content_size: int) -> None:
+    def _validate_file(self, file_path: str) -> None:
+        """
+        Parse an XML file incrementally, clearing elements as they end so memory stays bounded
+        by the document depth rather than its size.
+
+        Raises:
+            etree.XMLSyntaxError: If the file is not well-formed
+        """
+        for _, elem in etree.iterparse(file_path, events=('end',), huge_tree=True):
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+    def _update_file_size(self, file_path: str, content_size: int, mtime_ns: int) -> None:
         """
         Update the total file size and store individual file sizes.
 
         Args:
             file_path (str): Path to the XML file
-            content_size (int): Size of the content written
+            content_size (int): Number of bytes written to the file
+            mtime_ns (int): Modification time of the file once written, in nanoseconds
         """
-        file_size = os.path.getsize(file_path)
-        self.total_size += file_size
-        self.original_total_size += content_size
-        self.written_files[file_path] = file_size
+        self.total_size += content_size
+        self.written_files[file_path] = (content_size, mtime_ns)
 
-    def _update_char_count(self, file_path: str, content: str) -> None:
+    def _update_char_count(self, file_path: str, char_count: int) -> None:
         """
         Update the character count for the given file.
 
         Args:
             file_path (str): Path to the XML file
-            content (str): Content written to the file
+            char_count (int): Length of the content written to the file, in bytes
         """
-        char_count = len(content)
-        if file_path in self.file_char_counts:
-            self.file_char_counts[file_path] += char_count
-        else:
-            self.file_char_counts[file_path] = char_count
+        self.file_char_counts[file_path] += char_count
 
     def ensure_file_exists(self, file_path: str) -> None:
         """
@@ -126,11 +178,16 @@ class XMLWriter:
         Args:
             file_path (str): Path to the XML file
         """
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        if not os.path.exists(file_path):
+        directory = os.path.dirname(file_path)
+        if directory not in self._ensured_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._ensured_dirs.add(directory)
+        # One stat tells both whether the file exists and whether it is empty
+        try:
+            if os.stat(file_path).st_size > 0:
+                warning(f"File {file_path} is not empty. It will be appended to.")
+        except FileNotFoundError:
             open(file_path, 'a').close()
-        elif os.path.getsize(file_path) > 0:
-            warning(f"File {file_path} is not empty. It will be appended to.")
 
     def get_file_hash(self, file_path: str) -> str:
         """
@@ -151,14 +208,10 @@ class XMLWriter:
         Returns:
             str: Summary of the XML writing process
         """
-        summary = f"Total XML content written: {self.total_size} bytes. " \
-                  f"Original content size: {self.original_total_size} bytes. " \
-                  f"Difference: {abs(self.total_size - self.original_total_size)} bytes " \
-                  f"({abs(self.total_size - self.original_total_size) / self.original_total_size * 100:.2f}%)\n"
+        summary = f"Total XML content written: {self.total_size} bytes.\n"
         
-        summary += "Character counts per file:\n"
-        for file_path, char_count in self.file_char_counts.items():
-            summary += f"{file_path}: {char_count} characters\n"
+        summary += "Character counts per file (utf-8 bytes):\n"
+        summary += ''.join(f"{file_path}: {char_count} bytes\n" for file_path, char_count in self.file_char_counts.items())
 
         return summary
 
@@ -173,49 +226,78 @@ class XMLWriter:
             str: Pretty printed XML content
         """
         try:
-            # Remove XML declaration and root 'xml' tag
-            content = content.replace('<?xml version="1.0" ?>', '').strip()
-            if content.startswith('<xml>') and content.endswith('</xml>'):
-                content = content[5:-6].strip()
-
-            dom = xml.dom.minidom.parseString(f"<root>{content}</root>")
-            pretty_xml = dom.toprettyxml(indent="  ")
-            
-            # Remove added root tags and clean up empty lines
-            pretty_xml = pretty_xml.replace('<?xml version="1.0" ?>\n', '')
-            pretty_xml = pretty_xml.replace('<root>\n', '').replace('</root>', '')
-            pretty_xml = '\n'.join([line for line in pretty_xml.split('\n') if line.strip()])
-            
-            return pretty_xml
+            return self._serialize_wrapped(self._parse_wrapped(content))
         except Exception as e:
             error(f"Error pretty printing XML content: {str(e)}")
             return content
 
-    def validate_all_files(self) -> None:
-        """
-        Perform a sanity check on all written files to ensure they are valid XML files.
+    def _parse_wrapped(self, content: str):
         """
-        for file_path in self.written_files:
-            try:
-                self._validate_xml(file_path)
-                debug(f"Validated XML file: {file_path}")
-            except ET.ParseError as e:
-                error(f"Invalid XML in file {file_path}: {str(e)}")
+        Parse XML content inside a synthetic <root> element, dropping any XML declaration and 'xml' wrapper.
 
-    def check_total_filesize(self) -> bool:
+        Raises:
+            etree.XMLSyntaxError: If the content is not well-formed
         """
-        Check if the total filesize of all written files is within 5% of the original summed file sizes.
+        # Remove XML declaration and root 'xml' tag. Both can only appear at the ends, so they
+        # are checked there instead of searched for; content without them is not copied
+        content = content.strip()
+        if content.startswith(_XML_DECLARATION):
+            content = content[len(_XML_DECLARATION):].lstrip()
+        if content.startswith('<xml>') and content.endswith('</xml>'):
+            content = content[5:-6].strip()
+        return etree.fromstring(b'<root>' + content.encode('utf-8') + b'</root>', self._get_parser())
+
+    def _get_parser(self):
+        """Return this thread's XML parser, creating it on first use."""
+        parser = getattr(self._local, 'parser', None)
+        if parser is None:
+            parser = self._local.parser = etree.XMLParser(remove_blank_text=True, strip_cdata=False, huge_tree=True, collect_ids=False)
+        return parser
+
+    def _write_wrapped(self, f, root) -> None:
+        """Pretty print a tree returned by _parse_wrapped into a binary file, without its <root> wrapper."""
+        etree.indent(root, space="  ")
+        f.write((root.text or '').removeprefix('\n').encode('utf-8'))
+        children = list(root)
+        # The newline before </root> belongs to the wrapper
+        if children and children[-1].tail:
+            children[-1].tail = children[-1].tail.removesuffix('\n')
+        for child in children:
+            # A top-level element with no children, such as an empty <config>, keeps its blank text,
+            # which indent() leaves alone; the old pretty printer dropped the blank lines in it
+            if len(child) == 0 and child.text and not child.text.strip() and '\n' in child.text:
+                child.text = '\n'
+            # Writes the child and its tail, without an XML declaration for utf-8
+            etree.ElementTree(child).write(f, encoding='utf-8')
+
+    def _serialize_wrapped(self, root) -> str:
+        """Pretty print a tree returned by _parse_wrapped, without its <root> wrapper."""
+        # indent() replaces the whitespace between elements instead of adding to it, so the
+        # output has no blank lines to filter out afterwards
+        etree.indent(root, space="  ")
+        pretty_xml = etree.tostring(root, encoding='unicode')
+
+        # Remove added root tags
+        return pretty_xml.removeprefix('<root>\n').removesuffix('\n</root>')
 
-        Returns:
-            bool: True if within 5%, False otherwise
+    def validate_all_files(self) -> None:
         """
-        total_written_size = sum(self.written_files.values())
-        difference = abs(total_written_size - self.original_total_size)
-        percentage_difference = (difference / self.original_total_size) * 100
+        Perform a sanity check on all written files to ensure they are valid XML files.
 
-        if percentage_difference <= 5:
-            debug(f"Total filesize is within 5% of original size. Difference: {percentage_difference:.2f}%")
-            return True
-        else:
-            warning(f"Total filesize differs by more than 5% from the original size. Difference: {percentage_difference:.2f}%")
-            return False
+        write() already validates each file's content in memory, so only files whose size or
+        modification time on disk no longer matches what write() wrote are read back and parsed again.
+        """
+        stale = [file_path for file_path, stamp in self.written_files.items() if self._file_stamp(file_path) != stamp]
+        if not stale:
+            return
+        # lxml releases the GIL while parsing, so the files are checked on a thread pool
+        with ThreadPoolExecutor(max_workers=min(8, len(stale))) as executor:
+            list(executor.map(self._validate_xml, stale))
+
+    def _file_stamp(self, file_path: str):
+        """Return the (size, st_mtime_ns) of a file on disk, or None if it cannot be stat'ed."""
+        try:
+            st = os.stat(file_path)
+            return st.st_size, st.st_mtime_ns
+        except OSError:
+            return None  # _validate_xml reports the missing file